@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Headless pagination benchmarks for GUI Less
+
+Generates synthetic text files and times the LessTextEdit operations that
+decide how responsive the viewer feels: opening a file, paginating it with
+and without word wrap, rendering pages, resizing and zooming. Runs without
+a display (QT_QPA_PLATFORM=offscreen) and writes the results as JSON, so
+runs of different versions can be compared.
+
+Usage:
+    python benchmarks/bench_pagination.py
+    python benchmarks/bench_pagination.py --sizes 1KB,1MB,1GB --kinds short --output before.json
+"""
+
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PyQt5.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt5.QtWidgets import QApplication
+
+import guiless
+from guiless import LessTextEdit
+
+
+SIZE_UNITS = {'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+DEFAULT_SIZES = '1KB,1MB,10MB,100MB'
+KINDS = ('short', 'long', 'markdown')
+BLOCK_BYTES = 1024 * 1024
+
+WORDS = ('the quick brown fox jumps over lazy dog lorem ipsum dolor sit amet request '
+         'response worker queue timeout retry cache page index buffer stream').split()
+
+
+def parse_size(text):
+    """Parse a size like '10MB' into bytes"""
+    text = text.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+def format_size(size):
+    """Format a byte count the way sizes are given on the command line"""
+    for unit, factor in reversed(SIZE_UNITS.items()):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return f"{size}B"
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def short_lines(rng):
+    """Log-like lines of about 80 characters"""
+    line = 0
+    while True:
+        line += 1
+        yield (f"2025-06-11 12:{line // 60 % 60:02d}:{line % 60:02d} INFO worker-{rng.randrange(16)} "
+               f"{sentence(rng, rng.randrange(4, 10))}\n")
+
+
+def long_lines(rng):
+    """Paragraphs on a single line, thousands of characters each"""
+    while True:
+        yield sentence(rng, rng.randrange(300, 1500)) + '\n'
+
+
+def markdown_lines(rng):
+    """A mix of headings, lists, code blocks, tables and long paragraphs"""
+    section = 0
+    while True:
+        section += 1
+        yield f"## Section {section}\n\n"
+        yield sentence(rng, rng.randrange(40, 400)) + '\n\n'
+        for _ in range(rng.randrange(2, 8)):
+            yield f"- {sentence(rng, rng.randrange(3, 20))}\n"
+        yield "\n```python\n"
+        for _ in range(rng.randrange(3, 15)):
+            yield f"    {rng.choice(WORDS)} = {rng.choice(WORDS)}({rng.randrange(100)})\n"
+        yield "```\n\n| key | value |\n|-----|-------|\n"
+        for _ in range(rng.randrange(2, 6)):
+            yield f"| {rng.choice(WORDS)} | {sentence(rng, 3)} |\n"
+        yield "\n"
+
+
+GENERATORS = {'short': short_lines, 'long': long_lines, 'markdown': markdown_lines}
+
+
+def generate_file(path, kind, size):
+    """Write a synthetic file of exactly size bytes, unless an identical one exists"""
+    if path.exists() and path.stat().st_size == size:
+        return
+    lines = GENERATORS[kind](random.Random(kind))
+    # Text is generated a block at a time and the blocks are repeated, so
+    # that even 1 GB files are written at disk speed
+    block = []
+    block_size = 0
+    while block_size < min(size, BLOCK_BYTES):
+        line = next(lines)
+        block.append(line)
+        block_size += len(line)
+    block = ''.join(block).encode('utf-8')
+
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining > 0:
+            f.write(block[:remaining])
+            remaining -= len(block)
+
+
+class Benchmark:
+    """Time LessTextEdit operations on one file and collect the results"""
+
+    def __init__(self, app, repeat, width, height):
+        self.app = app
+        self.repeat = repeat
+        self.width = width
+        self.height = height
+        self.results = []
+
+    def measure(self, file_info, operation, mode, func, setup=None):
+        """Run func repeat times and record the run times in seconds"""
+        runs = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            self.app.processEvents()
+            start = time.perf_counter()
+            func()
+            runs.append(time.perf_counter() - start)
+        result = dict(file_info, operation=operation, mode=mode, runs=runs,
+                      min_s=min(runs), median_s=statistics.median(runs))
+        self.results.append(result)
+        print(f"  {operation:<22} {mode:<7} median {result['median_s'] * 1000:10.2f} ms")
+        return result
+
+    def new_view(self):
+        view = LessTextEdit()
+        view.resize(self.width, self.height)
+        view.show()
+        self.app.processEvents()
+        return view
+
+    def run_file(self, path, kind, size):
+        """Benchmark every operation on one file"""
+        file_info = {'kind': kind, 'size': format_size(size), 'size_bytes': size}
+        views = []
+
+        def load():
+            view = self.new_view()
+            views.append(view)
+            view.load_file(str(path))
+
+        def close_views():
+            for view in views:
+                if view.source_document is not None:
+                    view.source_document.close()
+                view.deleteLater()
+            views.clear()
+
+        load_result = self.measure(file_info, 'load_file', 'wrap', load, setup=close_views)
+        view = views[-1]
+        file_info['lines'] = load_result['lines'] = view.source_document.line_count
+
+        for wrap in (False, True):
+            mode = 'wrap' if wrap else 'nowrap'
+
+            def set_mode(wrap=wrap):
+                view.toggle_word_wrap(wrap)
+                # Start from scratch rather than from the lazily wrapped chunks
+                view.pagination.wrap_paginator = None
+                view.pagination.page_cache.clear()
+
+            self.measure(file_info, 'calculate_pagination', mode, view.calculate_pagination, setup=set_mode)
+            total_pages = view.pagination.total_pages
+
+            self.measure(file_info, 'set_page_content', mode, lambda: view.set_page_content(1),
+                         setup=view.pagination.page_cache.clear)
+            self.measure(file_info, 'set_page_content_mid', mode,
+                         lambda: view.set_page_content(max(total_pages // 2, 1)),
+                         setup=view.pagination.page_cache.clear)
+
+            def set_mode_paginated(set_mode=set_mode):
+                set_mode()
+                view.calculate_pagination()
+
+            self.measure(file_info, 'paginate_to_end', mode, view.pagination.paginate_to_end,
+                         setup=set_mode_paginated)
+
+            def resize(view=view):
+                # What the main window does once a resize settles
+                view.resize(view.width() + 40, view.height() + 30)
+                self.app.processEvents()
+                view.calculate_pagination()
+                view.set_page_content(view.current_page)
+
+            view.set_page_content(1)
+            self.measure(file_info, 'resize', mode, resize)
+
+            def zoom(view=view):
+                view.zoom_in()
+                view.calculate_pagination()
+                view.set_page_content(view.current_page)
+
+            self.measure(file_info, 'zoom', mode, zoom)
+            view.reset_zoom()
+            view.resize(self.width, self.height)
+
+        close_views()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless pagination benchmarks for GUI Less")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"comma-separated file sizes, 1KB to 1GB (default: {DEFAULT_SIZES})")
+    parser.add_argument('--kinds', default=','.join(KINDS),
+                        help=f"comma-separated file kinds: {', '.join(KINDS)}")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per measurement (default: 3)")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'guiless-bench'),
+                        help="where generated files are kept between runs")
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON results file")
+    parser.add_argument('--width', type=int, default=800)
+    parser.add_argument('--height', type=int, default=600)
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    kinds = [kind.strip() for kind in args.kinds.split(',')]
+    for kind in kinds:
+        if kind not in GENERATORS:
+            parser.error(f"unknown kind: {kind}")
+
+    data_dir = Path(args.data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    benchmark = Benchmark(app, max(args.repeat, 1), args.width, args.height)
+
+    for kind in kinds:
+        for size in sizes:
+            path = data_dir / f"{kind}-{format_size(size)}.txt"
+            print(f"{path.name}: generating...", end=' ', flush=True)
+            generate_file(path, kind, size)
+            print("benchmarking")
+            benchmark.run_file(path, kind, size)
+
+    report = {
+        'guiless_version': guiless.__doc__.split()[2],
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'qt': QT_VERSION_STR,
+        'pyqt': PYQT_VERSION_STR,
+        'platform': platform.platform(),
+        'qpa_platform': os.environ.get('QT_QPA_PLATFORM'),
+        'viewport': [args.width, args.height],
+        'repeat': args.repeat,
+        'results': benchmark.results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for GUI Less
+
+Starts GUI Less in fresh processes without a display (QT_QPA_PLATFORM=
+offscreen), opens a file and measures the time to the first page: from
+the moment guiless starts being imported until the first page has been
+set up, as recorded by the --profile mode. The whole process lifetime is
+reported too. Results are written as JSON, like bench_pagination.py.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --file big.log --runs 20 --output startup.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+TARGET_MS = 300
+
+# Runs GUI Less with --profile and quits once the first page is shown
+HARNESS = """
+import sys
+import guiless
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+on_first_page_ready = guiless.GuiLess.on_first_page_ready
+
+def first_page_ready(window):
+    on_first_page_ready(window)
+    last, _ = guiless.profiler.stats('time_to_first_page')
+    print('TIME_TO_FIRST_PAGE', last, flush=True)
+    QTimer.singleShot(0, QApplication.instance().quit)
+
+guiless.GuiLess.on_first_page_ready = first_page_ready
+sys.argv = ['guiless', '--profile', sys.argv[1]]
+guiless.main()
+"""
+
+
+def run_once(file_path):
+    """Start GUI Less once; return (time to first page, process lifetime) in seconds"""
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen', PYTHONPATH=str(REPO_DIR))
+    # A throwaway home keeps the user's config and recent files out of the measurement
+    with tempfile.TemporaryDirectory() as home:
+        env['HOME'] = home
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', HARNESS, file_path], env=env,
+                                capture_output=True, text=True, timeout=120)
+        lifetime = time.perf_counter() - start
+    for line in result.stdout.splitlines():
+        if line.startswith('TIME_TO_FIRST_PAGE'):
+            return float(line.split()[1]), lifetime
+    raise RuntimeError(f"GUI Less did not show a first page:\n{result.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark for GUI Less")
+    parser.add_argument('--file', default=str(REPO_DIR / 'sample.txt'), help="file to open")
+    parser.add_argument('--runs', type=int, default=10, help="processes to start (default: 10)")
+    parser.add_argument('--output', default='startup_results.json', help="JSON results file")
+    args = parser.parse_args()
+
+    # The first start compiles guiless into __pycache__; later starts reuse it
+    run_once(args.file)
+
+    first_page = []
+    lifetime = []
+    for _ in range(max(args.runs, 1)):
+        ttfp, process = run_once(args.file)
+        first_page.append(ttfp)
+        lifetime.append(process)
+        print(f"  time to first page {ttfp * 1000:8.1f} ms   process {process * 1000:8.1f} ms")
+
+    median = statistics.median(first_page)
+    print(f"Median time to first page: {median * 1000:.1f} ms (target {TARGET_MS} ms)")
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'file': args.file,
+        'file_size': os.path.getsize(args.file),
+        'target_ms': TARGET_MS,
+        'time_to_first_page': {'runs': first_page, 'min_s': min(first_page), 'median_s': median},
+        'process_lifetime': {'runs': lifetime, 'min_s': min(lifetime),
+                             'median_s': statistics.median(lifetime)},
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Theme switch benchmark for GUI Less
+
+Opens a file in the main window without a display (QT_QPA_PLATFORM=
+offscreen) and switches through every theme, timing apply_theme on its
+own and together with the repaint that follows. A switch should fit in
+one frame at 60 Hz. Results are written as JSON, like bench_pagination.py.
+
+Usage:
+    python benchmarks/bench_theme.py
+    python benchmarks/bench_theme.py --file big.log --rounds 20 --output theme.json
+"""
+
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+# A throwaway home keeps the user's config and recent files out of the measurement
+os.environ['HOME'] = tempfile.mkdtemp(prefix='guiless-bench-')
+
+from PyQt5.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt5.QtWidgets import QApplication
+
+import guiless
+
+FRAME_MS = 1000 / 60
+
+
+def summary(runs):
+    return {'runs': runs, 'min_s': min(runs), 'median_s': statistics.median(runs), 'max_s': max(runs)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Theme switch benchmark for GUI Less")
+    parser.add_argument('--file', default=str(REPO_DIR / 'sample.txt'), help="file to open")
+    parser.add_argument('--rounds', type=int, default=10, help="passes through all themes (default: 10)")
+    parser.add_argument('--output', default='theme_results.json', help="JSON results file")
+    parser.add_argument('--width', type=int, default=1000)
+    parser.add_argument('--height', type=int, default=700)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = guiless.GuiLess()
+    window.resize(args.width, args.height)
+    window.show()
+    # Report a failure here rather than in a message box nobody can close.
+    # load_document() connects the loader to this before starting it.
+    errors = []
+    window.on_load_failed = errors.append
+    window.load_document(args.file)
+    loader = window.file_loader
+    while not loader.isFinished():
+        app.processEvents()
+        time.sleep(0.01)
+    app.processEvents()  # Deliver what the loader sent last
+    if errors:
+        sys.exit(f"Failed to open {args.file}: {errors[0]}")
+    if not window.text_edit_1.toPlainText():
+        sys.exit(f"{args.file} is empty, so there is nothing to repaint")
+
+    names = window.theme_manager.get_theme_names()
+    apply_runs = {name: [] for name in names}
+    frame_runs = {name: [] for name in names}
+    for _ in range(max(args.rounds, 1)):
+        for name in names:
+            start = time.perf_counter()
+            window.apply_theme(name)
+            applied = time.perf_counter()
+            app.processEvents()
+            done = time.perf_counter()
+            apply_runs[name].append(applied - start)
+            frame_runs[name].append(done - start)
+
+    for name in names:
+        print(f"  {name:<16} apply {statistics.median(apply_runs[name]) * 1000:7.2f} ms   "
+              f"with repaint {statistics.median(frame_runs[name]) * 1000:7.2f} ms")
+    worst = max(max(runs) for runs in frame_runs.values())
+    print(f"Slowest theme switch: {worst * 1000:.2f} ms (one frame is {FRAME_MS:.1f} ms)")
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'qt': QT_VERSION_STR,
+        'pyqt': PYQT_VERSION_STR,
+        'platform': platform.platform(),
+        'qpa_platform': os.environ.get('QT_QPA_PLATFORM'),
+        'file': args.file,
+        'viewport': [args.width, args.height],
+        'frame_ms': FRAME_MS,
+        'results': [{'theme': name, 'apply_theme': summary(apply_runs[name]),
+                     'with_repaint': summary(frame_runs[name])} for name in names],
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,25 +7,146 @@ For version history and detailed changelog, see:
 https://github.com/juren53/guiless/blob/main/CHANGELOG.md
 """
 
+import time
+STARTED_AT = time.perf_counter()  # Time to first page is measured from here
+
 import sys
 import os
 import json
-import webbrowser
+import codecs
+import mmap
+import zlib
+import bz2
+import lzma
 import re
-import textwrap
+import threading
+import queue
+import argparse
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from functools import lru_cache, wraps
 from pathlib import Path
-try:
-    import markdown
-    MARKDOWN_AVAILABLE = True
-except ImportError:
-    MARKDOWN_AVAILABLE = False
+# Modules that only some features need (markdown, zstandard, webbrowser,
+# the process pool of parallel search) are imported on first use, so they
+# don't delay the first page
 from PyQt5.QtWidgets import (QDialog, QLineEdit, QPushButton, QDialogButtonBox,
-    QApplication, QMainWindow, QTextEdit, QVBoxLayout, QHBoxLayout,
+    QApplication, QMainWindow, QPlainTextEdit, QVBoxLayout, QHBoxLayout,
     QWidget, QMenuBar, QAction, QFileDialog, QMessageBox, QSplitter,
-    QCheckBox, QLabel, QToolBar, QStatusBar, QComboBox
+    QCheckBox, QLabel, QToolBar, QStatusBar, QComboBox, QTextEdit
 )
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QSizeF
-from PyQt5.QtGui import QFont, QKeySequence, QTextCursor, QTextDocument, QTextCharFormat, QColor
+from PyQt5.QtCore import Qt, QTimer, QThread, QFileSystemWatcher, pyqtSignal, QSizeF
+from PyQt5.QtGui import QFont, QKeySequence, QTextCursor, QTextDocument, QTextCharFormat, QColor, QPalette
+
+
+@lru_cache(maxsize=None)
+def optional_module(name):
+    """Import an optional package on first use; None if it is not installed"""
+    try:
+        return __import__(name)
+    except ImportError:
+        return None
+
+
+def memory_usage():
+    """Return the resident memory of this process in bytes, or None if unknown"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current usage; reported in KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Profiler:
+    """Timing spans of the hot paths, for the --profile debug mode
+
+    Methods decorated with @profiled record a span per call while profiling
+    is enabled; disabled, they cost one attribute check. The recent run
+    times of each span give the last and 95th percentile timings of the
+    status bar readout, and the whole session can be saved as a Chrome
+    trace (chrome://tracing, Perfetto) to diagnose reported slowness.
+    """
+
+    HISTORY = 200  # Run times kept per span for the percentiles
+    MAX_EVENTS = 200000  # Trace events kept; the oldest are dropped
+
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=self.MAX_EVENTS)
+        self.durations = {}
+        self.thread_names = {}
+
+    def record(self, name, start, end):
+        """Record a span that ran from start to end (perf_counter seconds)"""
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            # Worker threads are QThreads; they are named after their class
+            is_gui = tid == threading.main_thread().ident
+            self.thread_names[tid] = 'GUI' if is_gui else type(QThread.currentThread()).__name__
+        self.events.append(('X', name, start, end, tid))
+        history = self.durations.get(name)
+        if history is None:
+            history = self.durations[name] = deque(maxlen=self.HISTORY)
+        history.append(end - start)
+
+    def record_memory(self, rss):
+        """Record a memory sample, shown as a counter track in the trace"""
+        self.events.append(('C', 'memory', time.perf_counter(), rss, threading.get_ident()))
+
+    def stats(self, name):
+        """Return (last, p95) run times of a span in seconds, or None if it never ran"""
+        history = self.durations.get(name)
+        if not history:
+            return None
+        samples = sorted(history)
+        return history[-1], samples[min(int(len(samples) * 0.95), len(samples) - 1)]
+
+    def clear(self):
+        self.events.clear()
+        self.durations.clear()
+
+    def dump_trace(self, path):
+        """Write the recorded session as Chrome trace-event JSON"""
+        pid = os.getpid()
+        trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in self.thread_names.items()]
+        for phase, name, start, end, tid in list(self.events):
+            event = {'name': name, 'ph': phase, 'ts': (start - self.origin) * 1e6, 'pid': pid, 'tid': tid}
+            if phase == 'X':
+                event['dur'] = (end - start) * 1e6
+                event['cat'] = 'guiless'
+            else:
+                event['args'] = {'rss_mb': round(end / (1024 * 1024), 1)}
+            trace.append(event)
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+
+
+profiler = Profiler()
+
+
+def profiled(name):
+    """Record each call of a method as a profiler span while profiling is on"""
+    def decorate(method):
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return method(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                profiler.record(name, start, time.perf_counter())
+        return wrapper
+    return decorate
 
 
 class ThemeManager:
@@ -39,6 +160,8 @@ class ThemeManager:
                 'text': '#000000',
                 'selection_bg': '#3399ff',
                 'selection_text': '#ffffff',
+                'highlight_bg': '#ffeb3b',
+                'highlight_text': '#000000',
                 'menubar_bg': '#f0f0f0',
                 'menubar_text': '#000000',
                 'toolbar_bg': '#f5f5f5',
@@ -55,6 +178,8 @@ class ThemeManager:
                 'text': '#ffffff',
                 'selection_bg': '#4a9eff',
                 'selection_text': '#ffffff',
+                'highlight_bg': '#806600',
+                'highlight_text': '#ffffff',
                 'menubar_bg': '#3c3c3c',
                 'menubar_text': '#ffffff',
                 'toolbar_bg': '#404040',
@@ -71,6 +196,8 @@ class ThemeManager:
                 'text': '#657b83',
                 'selection_bg': '#268bd2',
                 'selection_text': '#fdf6e3',
+                'highlight_bg': '#b58900',
+                'highlight_text': '#fdf6e3',
                 'menubar_bg': '#eee8d5',
                 'menubar_text': '#657b83',
                 'toolbar_bg': '#f5f0e7',
@@ -87,6 +214,8 @@ class ThemeManager:
                 'text': '#839496',
                 'selection_bg': '#268bd2',
                 'selection_text': '#002b36',
+                'highlight_bg': '#b58900',
+                'highlight_text': '#002b36',
                 'menubar_bg': '#073642',
                 'menubar_text': '#839496',
                 'toolbar_bg': '#0a3c47',
@@ -103,6 +232,8 @@ class ThemeManager:
                 'text': '#ffffff',
                 'selection_bg': '#ffff00',
                 'selection_text': '#000000',
+                'highlight_bg': '#00ffff',
+                'highlight_text': '#000000',
                 'menubar_bg': '#000000',
                 'menubar_text': '#ffffff',
                 'toolbar_bg': '#000000',
@@ -119,6 +250,8 @@ class ThemeManager:
                 'text': '#f8f8f2',
                 'selection_bg': '#49483e',
                 'selection_text': '#f8f8f2',
+                'highlight_bg': '#e6db74',
+                'highlight_text': '#272822',
                 'menubar_bg': '#3e3d32',
                 'menubar_text': '#f8f8f2',
                 'toolbar_bg': '#414339',
@@ -135,6 +268,8 @@ class ThemeManager:
                 'text': '#cdd6f4',
                 'selection_bg': '#7c3aed',
                 'selection_text': '#ffffff',
+                'highlight_bg': '#f9e2af',
+                'highlight_text': '#1e1e2e',
                 'menubar_bg': '#2a2a40',
                 'menubar_text': '#cdd6f4',
                 'toolbar_bg': '#313244',
@@ -151,6 +286,8 @@ class ThemeManager:
                 'text': '#00ff00',
                 'selection_bg': '#008000',
                 'selection_text': '#000000',
+                'highlight_bg': '#33ff33',
+                'highlight_text': '#000000',
                 'menubar_bg': '#001100',
                 'menubar_text': '#00ff00',
                 'toolbar_bg': '#002200',
@@ -163,6 +300,7 @@ class ThemeManager:
             }
         }
         self.current_theme = 'Default'
+        self.stylesheets = {}  # theme name -> generated stylesheet
     
     def get_theme_names(self):
         """Get list of available theme names"""
@@ -172,6 +310,14 @@ class ThemeManager:
         """Get theme data by name"""
         return self.themes.get(theme_name, self.themes['Default'])
     
+    def get_stylesheet(self, theme_name):
+        """Get the stylesheet for a theme, generating it only the first time"""
+        theme_name = self.get_theme(theme_name)['name']
+        stylesheet = self.stylesheets.get(theme_name)
+        if stylesheet is None:
+            stylesheet = self.stylesheets[theme_name] = self.generate_stylesheet(theme_name)
+        return stylesheet
+    
     def generate_stylesheet(self, theme_name):
         """Generate CSS stylesheet for the given theme"""
         theme = self.get_theme(theme_name)
@@ -183,12 +329,8 @@ class ThemeManager:
             color: {theme['text']};
         }}
         
-        /* Text Edit Areas */
-        QTextEdit {{
-            background-color: {theme['background']};
-            color: {theme['text']};
-            selection-background-color: {theme['selection_bg']};
-            selection-color: {theme['selection_text']};
+        /* Text Edit Areas; the page colours come from the panes' palettes */
+        QTextEdit, QPlainTextEdit {{
             border: 1px solid {theme['border']};
             font-family: 'Courier New', 'Consolas', monospace;
         }}
@@ -349,87 +491,1888 @@ class ThemeManager:
         """
 
 
-class ThemeDialog(QDialog):
-    """Dialog for selecting application theme"""
-    
-    def __init__(self, current_theme, theme_manager, parent=None):
-        super().__init__(parent)
-        self.theme_manager = theme_manager
-        self.selected_theme = current_theme
-        
-        self.setWindowTitle("Select Theme")
-        self.setFixedSize(400, 200)
-        
-        layout = QVBoxLayout(self)
-        
-        # Theme selection
-        layout.addWidget(QLabel("Choose a theme:"))
-        
-        self.theme_combo = QComboBox()
-        self.theme_combo.addItems(self.theme_manager.get_theme_names())
-        self.theme_combo.setCurrentText(current_theme)
-        self.theme_combo.currentTextChanged.connect(self.on_theme_changed)
-        layout.addWidget(self.theme_combo)
-        
-        # Preview label
-        self.preview_label = QLabel("Preview: This is how text will look with the selected theme")
-        self.preview_label.setStyleSheet("padding: 15px; border: 1px solid gray; min-height: 40px;")
-        self.preview_label.setWordWrap(True)
-        layout.addWidget(self.preview_label)
-        
-        # Buttons
-        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        button_box.accepted.connect(self.accept)
-        button_box.rejected.connect(self.reject)
-        layout.addWidget(button_box)
-        
-        # Set initial preview
-        self.update_preview()
-    
-    def on_theme_changed(self, theme_name):
-        """Handle theme selection change"""
-        self.selected_theme = theme_name
-        self.update_preview()
-    
-    def update_preview(self):
-        """Update the preview with selected theme colors"""
-        theme = self.theme_manager.get_theme(self.selected_theme)
-        self.preview_label.setStyleSheet(f"""
-            background-color: {theme['background']};
-            color: {theme['text']};
-            padding: 10px;
-            border: 1px solid {theme['border']};
-        """)
-    
-    def get_selected_theme(self):
-        """Get the selected theme name"""
-        return self.selected_theme
+class ThemeDialog(QDialog):
+    """Dialog for selecting application theme"""
+    
+    def __init__(self, current_theme, theme_manager, parent=None):
+        super().__init__(parent)
+        self.theme_manager = theme_manager
+        self.selected_theme = current_theme
+        
+        self.setWindowTitle("Select Theme")
+        self.setFixedSize(400, 200)
+        
+        layout = QVBoxLayout(self)
+        
+        # Theme selection
+        layout.addWidget(QLabel("Choose a theme:"))
+        
+        self.theme_combo = QComboBox()
+        self.theme_combo.addItems(self.theme_manager.get_theme_names())
+        self.theme_combo.setCurrentText(current_theme)
+        self.theme_combo.currentTextChanged.connect(self.on_theme_changed)
+        layout.addWidget(self.theme_combo)
+        
+        # Preview label
+        self.preview_label = QLabel("Preview: This is how text will look with the selected theme")
+        self.preview_label.setStyleSheet("padding: 15px; border: 1px solid gray; min-height: 40px;")
+        self.preview_label.setWordWrap(True)
+        layout.addWidget(self.preview_label)
+        
+        # Buttons
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        
+        # Set initial preview
+        self.update_preview()
+    
+    def on_theme_changed(self, theme_name):
+        """Handle theme selection change"""
+        self.selected_theme = theme_name
+        self.update_preview()
+    
+    def update_preview(self):
+        """Update the preview with selected theme colors"""
+        theme = self.theme_manager.get_theme(self.selected_theme)
+        self.preview_label.setStyleSheet(f"""
+            background-color: {theme['background']};
+            color: {theme['text']};
+            padding: 10px;
+            border: 1px solid {theme['border']};
+        """)
+    
+    def get_selected_theme(self):
+        """Get the selected theme name"""
+        return self.selected_theme
+
+
+class FindDialog(QDialog):
+    def __init__(self, parent=None, text='', regex=False, ignore_case=False, whole_word=False):
+        super().__init__(parent)
+        self.setWindowTitle("Find")
+        self.setFixedSize(300, 170)
+
+        self.layout = QVBoxLayout(self)
+        self.find_input = QLineEdit(self)
+        self.find_input.setText(text)
+        self.find_input.selectAll()
+        self.layout.addWidget(self.find_input)
+
+        # Search options
+        self.regex_checkbox = QCheckBox("Regular expression", self)
+        self.regex_checkbox.setChecked(regex)
+        self.layout.addWidget(self.regex_checkbox)
+
+        self.ignore_case_checkbox = QCheckBox("Ignore case", self)
+        self.ignore_case_checkbox.setChecked(ignore_case)
+        self.layout.addWidget(self.ignore_case_checkbox)
+
+        self.whole_word_checkbox = QCheckBox("Whole word", self)
+        self.whole_word_checkbox.setChecked(whole_word)
+        self.layout.addWidget(self.whole_word_checkbox)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        self.layout.addWidget(self.button_box)
+
+    def text(self):
+        return self.find_input.text()
+
+    def options(self):
+        """Return the (regex, ignore_case, whole_word) search options"""
+        return (self.regex_checkbox.isChecked(), self.ignore_case_checkbox.isChecked(),
+                self.whole_word_checkbox.isChecked())
+
+
+# Byte order marks, longest first (the UTF-32-LE mark starts with the UTF-16-LE one)
+BYTE_ORDER_MARKS = [
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+ENCODING_SAMPLE_BYTES = 16 * 1024
+# How far a search match may run on past the chunk it starts in
+MATCH_LOOKAHEAD_BYTES = 64 * 1024
+# Characters that take a surrogate pair, two code units, in UTF-16
+ASTRAL_CHARACTERS = re.compile('[\U00010000-\U0010ffff]')
+
+
+def detect_encoding(sample):
+    """Guess the encoding of a text file from its first bytes
+
+    Returns (encoding, BOM length). Only ENCODING_SAMPLE_BYTES of the
+    sample are looked at, so the guess costs the same for any file size.
+    """
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if sample.startswith(bom):
+            return encoding, len(bom)
+
+    sample = sample[:ENCODING_SAMPLE_BYTES]
+    # UTF-16 without a BOM: mostly ASCII text has a zero in every other byte
+    if sample.count(0) > len(sample) // 4:
+        even_zeros = sample[0::2].count(0)
+        odd_zeros = sample[1::2].count(0)
+        if odd_zeros > 2 * even_zeros:
+            return 'utf-16-le', 0
+        if even_zeros > 2 * odd_zeros:
+            return 'utf-16-be', 0
+
+    try:
+        # Incremental, so a character cut off at the end of the sample is not an error
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8', 0
+    except UnicodeDecodeError:
+        pass
+
+    # Single-byte text: Windows-1252, unless it uses bytes that code page leaves undefined
+    if any(byte in sample for byte in b'\x81\x8d\x8f\x90\x9d'):
+        return 'latin-1', 0
+    return 'cp1252', 0
+
+
+class MappedDocument:
+    """Read-only, memory-mapped view of a text file
+
+    The file is never read into a Python string. Lines are located through
+    a table of byte offsets and only the byte ranges that are actually shown
+    get decoded, so opening a huge file costs about as much memory as
+    opening a small one.
+
+    The line index is an array('Q') built in a single pass. It can be built
+    up front or a chunk at a time with index_more() (see FileLoader), in
+    which case only the lines indexed so far are visible. Every page lookup
+    is an O(page) slice of the map.
+
+    Without an explicit encoding, it is guessed from the first bytes (see
+    detect_encoding()); a byte order mark is skipped. Line breaks are found
+    in the encoded bytes, so UTF-16 and UTF-32 files are indexed without
+    being decoded either.
+    """
+
+    # Bytes read per step while indexing; a multiple of every code unit width
+    INDEX_BLOCK_BYTES = 4 * 1024 * 1024
+    # Lines longer than this are decoded from the nearest character mark
+    LONG_LINE_BYTES = 1024 * 1024
+    CHAR_MARK_BYTES = 64 * 1024
+    CACHED_CHAR_MARKS = 16
+
+    def __init__(self, file_path, encoding=None, build_index=True):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        try:
+            self.size = os.fstat(self._file.fileno()).st_size
+            if self.size:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                # mmap refuses zero-length files
+                self._map = b''
+        except Exception:
+            self._file.close()
+            raise
+
+        self.set_encoding(encoding, self.read(0, ENCODING_SAMPLE_BYTES))
+        self.indexed_bytes = self.line_starts[0]
+        self.index_complete = False
+        if build_index:
+            self.index_more(self.size)
+
+    def set_encoding(self, encoding, sample):
+        """Use an encoding, or the one detected from a sample of the first bytes"""
+        bom_length = 0
+        if encoding is None:
+            encoding, bom_length = detect_encoding(sample)
+        self.encoding = encoding
+        self.newline = '\n'.encode(encoding)
+        # The first line starts after the byte order mark
+        self.line_starts = array('Q', [bom_length])
+        self.char_marks = OrderedDict()  # (start, end) of a long line -> see line_char_marks()
+
+    def index_line_breaks(self, data, start, end, base=0):
+        """Add the lines that start after the line breaks in data[start:end]
+
+        base is the file offset of data[0]. For multi-byte code units, end
+        must not split a code unit and a line break only counts at a code
+        unit boundary, not inside another character.
+        """
+        append = self.line_starts.append
+        find = data.find
+        newline = self.newline
+        width = len(newline)
+        pos = find(newline, start, end)
+        if width == 1:
+            while pos != -1:
+                append(base + pos + 1)
+                pos = find(newline, pos + 1, end)
+            return
+        while pos != -1:
+            if (base + pos) % width:
+                pos = find(newline, pos + 1, end)
+                continue
+            append(base + pos + width)
+            pos = find(newline, pos + width, end)
+
+    def index_more(self, max_bytes):
+        """Extend the line index by up to max_bytes; return True when complete
+
+        The bytes are read with read() a block at a time, so a file that
+        shrinks meanwhile stops the index short (see shrunk()) instead of
+        faulting on the map.
+        """
+        end = min(self.size, self.indexed_bytes + max_bytes)
+        if end < self.size:
+            end -= end % len(self.newline)
+        pos = self.indexed_bytes
+        while pos < end:
+            block_end = min(pos + self.INDEX_BLOCK_BYTES, end)
+            data = self.read(pos, block_end)
+            if len(data) < block_end - pos:
+                break  # The file shrank
+            self.index_line_breaks(data, 0, len(data), pos)
+            pos = block_end
+        self.indexed_bytes = pos
+        self.index_complete = pos >= self.size
+        return self.index_complete
+
+    def shrunk(self):
+        """Check whether the file is now shorter than when it was mapped
+
+        Touching the map past the new end of a truncated file (e.g. by
+        logrotate's copytruncate) raises SIGBUS, which kills the process, so
+        the owner reopens the document instead.
+        """
+        return os.fstat(self._file.fileno()).st_size < self.size
+
+    def refresh(self):
+        """Pick up data appended to the file since it was mapped
+
+        Returns the number of new bytes, which still have to be indexed with
+        index_more(), or -1 if the file shrank (it was truncated or rewritten)
+        and has to be reopened.
+        """
+        size = os.fstat(self._file.fileno()).st_size
+        if size < self.size:
+            return -1
+        if size == self.size:
+            return 0
+
+        # The old map is not closed here; it is released once nothing
+        # references it any more
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        grown = size - self.size
+        self.size = size
+        self.index_complete = False
+        return grown
+
+    @property
+    def buffer(self):
+        """The mapped bytes; a later refresh() maps a new buffer and leaves this one intact"""
+        return self._map
+
+    @property
+    def index_progress(self):
+        """Percentage of the file indexed so far"""
+        return int(self.indexed_bytes * 100 / max(self.size, 1))
+
+    def read(self, start, end):
+        """Return the bytes [start, end) of the file, fewer if it has shrunk
+
+        Pages are read with pread() rather than sliced from the map, so a
+        truncated file gives a short read instead of SIGBUS.
+        """
+        if end <= start:
+            return b''
+        return os.pread(self._file.fileno(), end - start, start)
+
+    def line_for_offset(self, offset):
+        """Return the 0-based line holding a byte offset"""
+        return bisect_right(self.line_starts, offset) - 1
+
+    @property
+    def line_count(self):
+        """Number of lines indexed so far, counted like str.split('\\n')"""
+        if self.index_complete:
+            return len(self.line_starts)
+        # The last start belongs to a line whose end has not been found yet
+        return len(self.line_starts) - 1
+
+    @property
+    def estimated_line_count(self):
+        """Line count used for page totals; see FilteredDocument"""
+        return self.line_count
+
+    @property
+    def source(self):
+        """The MappedDocument holding the bytes; a plain document is its own source"""
+        return self
+
+    def ensure_lines(self, count):
+        """Make at least count lines available; FileLoader does the indexing here"""
+
+    def line_number(self, line_index):
+        """Return the 1-based line number shown for a 0-based line"""
+        return line_index + 1
+
+    def line_byte_range(self, start_line, end_line):
+        """Return the (start, end) byte range of lines [start_line, end_line)
+
+        The range excludes the newline that terminates the last line.
+        """
+        start = self.line_starts[start_line]
+        if end_line < len(self.line_starts):
+            # While indexing, that includes the start after the last line counted
+            end = self.line_starts[end_line] - len(self.newline)
+        else:
+            end = self.size
+        return start, end
+
+    def iter_line_lengths(self):
+        """Yield the byte length of every line without decoding anything"""
+        line_starts = self.line_starts
+        width = len(self.newline)
+        for i in range(1, len(line_starts)):
+            yield line_starts[i] - line_starts[i - 1] - width
+        if self.index_complete:
+            yield self.size - line_starts[-1]
+
+    def decode(self, start, end):
+        """Decode the byte range [start, end) of the file"""
+        return self.read(start, end).decode(self.encoding, errors='replace')
+
+    def line_size(self, line_index):
+        """Return the byte length of a line, without its newline"""
+        start, end = self.line_byte_range(line_index, line_index + 1)
+        return end - start
+
+    def line_char_marks(self, line_index, character=None, offset=None):
+        """Return (characters, offsets) of points in a line where decoding can start
+
+        Each mark is a byte offset at a character boundary, about every
+        CHAR_MARK_BYTES, and the number of characters before it in the line.
+        Marks are found in one pass over the line that goes only as far as
+        the first mark past the given character or offset, and picks up
+        from there next time. They are kept for the most recently used
+        lines, so a page in the middle of a line of many megabytes decodes
+        only its own part of it, and page 1 not even the rest of the line.
+        """
+        start, end = self.line_byte_range(line_index, line_index + 1)
+        marks = self.char_marks.get((start, end))
+        if marks is None:
+            decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+            # characters, offsets, and the decoder, offset and count of the pass
+            marks = self.char_marks[(start, end)] = [array('Q', [0]), array('Q', [start]), decoder, start, 0]
+            if len(self.char_marks) > self.CACHED_CHAR_MARKS:
+                self.char_marks.popitem(last=False)
+        else:
+            self.char_marks.move_to_end((start, end))
+
+        characters, offsets, decoder, pos, count = marks
+        while pos < end and not (character is not None and characters[-1] > character or
+                                 offset is not None and offsets[-1] > offset):
+            data = self.read(pos, min(pos + self.CHAR_MARK_BYTES, end))
+            if not data:
+                break  # The file shrank
+            count += len(decoder.decode(data))
+            pos += len(data)
+            if not decoder.getstate()[0]:
+                characters.append(count)
+                offsets.append(pos)
+        marks[3:] = pos, count
+        return characters, offsets
+
+    def decode_line_span(self, line_index, start, end):
+        """Decode at least the characters [start, end) of a line
+
+        Returns (first, text), where first is the index in the line of the
+        first character of text. Short lines are decoded whole.
+        """
+        line_start, line_end = self.line_byte_range(line_index, line_index + 1)
+        if line_end - line_start <= self.LONG_LINE_BYTES:
+            return 0, self.get_lines(line_index, line_index + 1)[0]
+        characters, offsets = self.line_char_marks(line_index, character=start)
+        mark = bisect_right(characters, start) - 1
+        # No supported encoding takes more than 4 bytes per character
+        window_end = min(offsets[mark] + 4 * (end - characters[mark]), line_end)
+        text = self.decode(offsets[mark], window_end)
+        if window_end == line_end and text.endswith('\r'):
+            text = text[:-1]  # As get_lines() drops it
+        return characters[mark], text
+
+    def column_for_offset(self, line_index, offset):
+        """Return the number of characters of a line before a byte offset in it"""
+        line_start = self.line_starts[line_index]
+        if offset - line_start <= self.LONG_LINE_BYTES:
+            return len(self.decode(line_start, offset))
+        characters, offsets = self.line_char_marks(line_index, offset=offset)
+        mark = bisect_right(offsets, offset) - 1
+        return characters[mark] + len(self.decode(offsets[mark], offset))
+
+    def get_lines(self, start_line=0, end_line=None, max_chars=None):
+        """Return the text of lines [start_line, end_line) as a list
+
+        With max_chars, every line is cut to that many characters, and a
+        long line is decoded only that far.
+        """
+        line_count = self.line_count
+        end_line = line_count if end_line is None else min(end_line, line_count)
+        if start_line >= end_line:
+            return []
+        if max_chars is not None:
+            return [self.decode_line_span(line, 0, max_chars)[1][:max_chars]
+                    for line in range(start_line, end_line)]
+
+        start, end = self.line_byte_range(start_line, end_line)
+        text = self.decode(start, end).replace('\r\n', '\n')
+        if text.endswith('\r'):
+            text = text[:-1]
+        lines = text.split('\n')
+        if len(lines) < end_line - start_line:
+            # The file shrank under the index; the owner reloads it
+            lines.extend([''] * (end_line - start_line - len(lines)))
+        return lines
+
+    def close(self):
+        """Release the mapping and the underlying file handle"""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+
+class DecompressionCursor:
+    """Decompress a file front to back from a seek point of a CompressedDocument
+
+    Concatenated streams (gzip members, bzip2 streams, xz streams, zstd
+    frames) are decompressed one after the other, as gzip -dc does.
+    """
+
+    READ_BYTES = 64 * 1024
+
+    def __init__(self, file, compression, in_offset=0, out_offset=0, state=None):
+        self.file = file
+        self.compression = compression
+        self.in_offset = in_offset  # Compressed bytes consumed
+        self.out_offset = out_offset  # Decompressed bytes produced
+        # A copy, so the seek point can be restored again later
+        self.decompressor = state.copy() if state is not None else self.new_decompressor()
+        self.stream_start = state is None  # Nothing fed to the decompressor yet
+        self.eof = False
+
+    def new_decompressor(self):
+        if self.compression == 'gzip':
+            return zlib.decompressobj(wbits=31)
+        if self.compression == 'bzip2':
+            return bz2.BZ2Decompressor()
+        if self.compression == 'xz':
+            return lzma.LZMADecompressor()
+        return optional_module('zstandard').ZstdDecompressor().decompressobj()
+
+    def read_chunk(self):
+        """Decompress the next piece of the file; return b'' at the end"""
+        while not self.eof:
+            self.file.seek(self.in_offset)
+            data = self.file.read(self.READ_BYTES)
+            if not data:
+                # The end of the file, or of what was written of it so far
+                self.eof = True
+                break
+
+            decompressor = self.decompressor
+            try:
+                output = decompressor.decompress(data)
+            except (OSError, EOFError, ValueError, zlib.error, lzma.LZMAError):
+                if self.stream_start and self.out_offset:
+                    # Padding or garbage after the last stream is ignored, as gzip does
+                    self.eof = True
+                    break
+                raise
+            if decompressor.eof:
+                self.in_offset += len(data) - len(decompressor.unused_data)
+                self.decompressor = self.new_decompressor()
+                self.stream_start = True
+            else:
+                self.in_offset += len(data)
+                self.stream_start = False
+            if output:
+                self.out_offset += len(output)
+                return output
+        return b''
+
+
+class CompressedDocument(MappedDocument):
+    """Read-only view of a gzip, bzip2, xz or zstd compressed text file
+
+    Indexing decompresses the file once, front to back, without keeping the
+    text. Along the way it records seek points every CHECKPOINT_BYTES of
+    output, from which the bytes of any page are decompressed again on
+    demand, so a far page costs at most CHECKPOINT_BYTES of decompression
+    instead of everything before it. Decompressed blocks of recently viewed
+    pages are kept in a small LRU cache.
+
+    zlib can copy a decompressor mid-stream, so gzip files get seek points
+    throughout. bz2, lzma and zstd decompressors cannot be copied; their
+    seek points are at stream boundaries, which files compressed in
+    parallel (pbzip2, xz -T, zstd -T) have plenty of.
+    """
+
+    # Leading bytes of each supported format
+    MAGIC = {
+        b'\x1f\x8b': 'gzip',
+        b'BZh': 'bzip2',
+        b'\xfd7zXZ\x00': 'xz',
+        b'\x28\xb5\x2f\xfd': 'zstd',
+    }
+
+    CHECKPOINT_BYTES = 8 * 1024 * 1024
+    BLOCK_BYTES = 256 * 1024
+    CACHED_BLOCKS = 64
+
+    def __init__(self, file_path, compression, encoding=None, build_index=True):
+        if compression == 'zstd' and optional_module('zstandard') is None:
+            raise OSError("Reading .zst files requires the zstandard package (pip install zstandard)")
+        self.file_path = file_path
+        self.compression = compression
+        self._file = open(file_path, 'rb')
+        self._index_file = open(file_path, 'rb')
+        self.compressed_size = os.fstat(self._file.fileno()).st_size
+        self.size = 0  # Decompressed bytes indexed so far
+
+        sample = b''
+        if encoding is None:
+            sample = DecompressionCursor(self._file, compression).read_chunk()
+        self.set_encoding(encoding, sample)
+        self.indexed_bytes = 0
+        self.index_complete = False
+        self.index_cursor = DecompressionCursor(self._index_file, compression)
+        self.index_tail = b''  # Start of a line break cut off at the end of a chunk
+
+        # Seek points: decompressed offset, and (compressed offset, decompressor state)
+        self.checkpoint_offsets = array('Q', [0])
+        self.checkpoints = [(0, None)]
+
+        # Decompressing for display, independent of the indexing cursor
+        self.read_cursor = None
+        self.read_buffer = bytearray()  # Decompressed bytes from read_start on
+        self.read_start = 0
+        self.blocks = OrderedDict()
+
+        if build_index:
+            self.index_more(sys.maxsize)
+
+    @classmethod
+    def detect(cls, file_path):
+        """Return the compression format of a file, or None for an uncompressed file
+
+        A magic number alone is not proof: any text file can start with
+        "BZh". The format is confirmed by decompressing the first chunk.
+        """
+        with open(file_path, 'rb') as f:
+            head = f.read(6)
+            for magic, compression in cls.MAGIC.items():
+                if head.startswith(magic):
+                    break
+            else:
+                return None
+            if compression == 'zstd' and optional_module('zstandard') is None:
+                return compression  # CompressedDocument explains what is missing
+
+            f.seek(0)
+            cursor = DecompressionCursor(f, compression)
+            data = f.read(cursor.READ_BYTES)
+            try:
+                output = cursor.decompressor.decompress(data)
+            except Exception:
+                return None
+        # A few bytes that merely look like a header are not a stream either
+        if output or cursor.decompressor.eof or len(data) == cursor.READ_BYTES:
+            return compression
+        return None
+
+    @property
+    def index_progress(self):
+        return int(self.index_cursor.in_offset * 100 / max(self.compressed_size, 1))
+
+    def index_more(self, max_bytes):
+        """Decompress and index up to max_bytes more of the text; return True when complete"""
+        cursor = self.index_cursor
+        width = len(self.newline)
+        end = cursor.out_offset + max_bytes
+        while cursor.out_offset < end:
+            try:
+                chunk = cursor.read_chunk()
+            except (OSError, EOFError, ValueError, zlib.error, lzma.LZMAError):
+                # A corrupt file is shown up to the damage
+                cursor.eof = True
+            if cursor.eof:
+                break
+
+            data = self.index_tail + chunk
+            base = cursor.out_offset - len(data)
+            # Index whole code units only; the rest waits for the next chunk
+            data_end = len(data) - (cursor.out_offset % width)
+            self.index_line_breaks(data, 0, data_end, base)
+            self.index_tail = data[data_end:]
+            self.indexed_bytes = self.size = cursor.out_offset
+            self.add_checkpoint(cursor)
+
+        self.index_complete = cursor.eof
+        return self.index_complete
+
+    def add_checkpoint(self, cursor):
+        """Record a seek point at the cursor if the last one is far enough behind"""
+        if cursor.out_offset - self.checkpoint_offsets[-1] < self.CHECKPOINT_BYTES:
+            return
+        if cursor.stream_start:
+            state = None
+        elif self.compression == 'gzip':
+            state = cursor.decompressor.copy()
+        else:
+            return
+        # Seek point first: the GUI thread looks it up by the offset's index
+        self.checkpoints.append((cursor.in_offset, state))
+        self.checkpoint_offsets.append(cursor.out_offset)
+
+    def refresh(self):
+        """Compressed files are not followed; see MappedDocument.refresh()"""
+        return 0
+
+    def shrunk(self):
+        """Compressed files are read through file objects, which cannot fault"""
+        return False
+
+    @property
+    def buffer(self):
+        raise TypeError("A compressed document has no mapped buffer; use read()")
+
+    def read(self, start, end):
+        """Return the decompressed bytes [start, end)"""
+        if start >= end:
+            return b''
+        block_bytes = self.BLOCK_BYTES
+        first_block = start // block_bytes
+        last_block = (end - 1) // block_bytes
+        data = b''.join([self.block(index) for index in range(first_block, last_block + 1)])
+        base = first_block * block_bytes
+        return data[start - base:end - base]
+
+    def block(self, index):
+        """Return decompressed block index, from the cache or by decompressing it"""
+        block = self.blocks.get(index)
+        if block is not None:
+            self.blocks.move_to_end(index)
+            return block
+
+        block_bytes = self.BLOCK_BYTES
+        block_start = index * block_bytes
+        block_end = block_start + block_bytes
+        checkpoint = bisect_right(self.checkpoint_offsets, block_start) - 1
+        read_end = self.read_start + len(self.read_buffer)
+        if (self.read_cursor is None or self.read_start > block_start or
+                self.checkpoint_offsets[checkpoint] > read_end):
+            # Going back, or a seek point is closer than where reading stopped
+            in_offset, state = self.checkpoints[checkpoint]
+            self.read_cursor = DecompressionCursor(self._file, self.compression, in_offset,
+                                                   self.checkpoint_offsets[checkpoint], state)
+            self.read_buffer = bytearray()
+            self.read_start = self.checkpoint_offsets[checkpoint]
+
+        cursor = self.read_cursor
+        buffer = self.read_buffer
+        self.drop_read_buffer(block_start)
+        while self.read_start + len(buffer) < block_end and not cursor.eof:
+            try:
+                buffer += cursor.read_chunk()
+            except (OSError, EOFError, ValueError, zlib.error, lzma.LZMAError):
+                cursor.eof = True
+            # Skipped output is dropped as it comes, so seeking stays bounded in memory
+            self.drop_read_buffer(block_start)
+        block = bytes(buffer[:block_end - self.read_start])
+        self.drop_read_buffer(block_end)
+
+        self.blocks[index] = block
+        if len(self.blocks) > self.CACHED_BLOCKS:
+            self.blocks.popitem(last=False)
+        return block
+
+    def drop_read_buffer(self, offset):
+        """Discard the decompressed bytes before offset"""
+        drop = min(offset - self.read_start, len(self.read_buffer))
+        if drop > 0:
+            del self.read_buffer[:drop]
+            self.read_start += drop
+
+    def iter_chunks(self, chunk_bytes):
+        """Yield (offset, data) for the whole text, decompressed in chunks that end at line breaks
+
+        Uses its own file handle and cursor, so another thread (e.g. a
+        SearchEngine) can stream the file while pages are being shown.
+        """
+        with open(self.file_path, 'rb') as f:
+            cursor = DecompressionCursor(f, self.compression)
+            offset = 0
+            pending = b''
+            newline = self.newline
+            width = len(newline)
+            while True:
+                try:
+                    chunk = cursor.read_chunk()
+                except (OSError, EOFError, ValueError, zlib.error, lzma.LZMAError):
+                    chunk = b''
+                if not chunk:
+                    if pending:
+                        yield offset, pending
+                    return
+                pending += chunk
+                if len(pending) < chunk_bytes:
+                    continue
+                # Cut at a code unit boundary, so every chunk starts on one
+                cut = pending.rfind(newline)
+                while cut != -1 and cut % width:
+                    cut = pending.rfind(newline, 0, cut + width - 1)
+                if cut != -1:
+                    cut += width
+                    yield offset, pending[:cut]
+                    offset += cut
+                    pending = pending[cut:]
+
+    def decode(self, start, end):
+        """Decode the decompressed byte range [start, end)"""
+        return self.read(start, end).decode(self.encoding, errors='replace')
+
+    def close(self):
+        """Release the file handles and cached blocks"""
+        self.blocks.clear()
+        self._file.close()
+        self._index_file.close()
+
+
+def open_document(file_path, build_index=True):
+    """Open a text file as a MappedDocument, or a CompressedDocument if it is compressed"""
+    compression = CompressedDocument.detect(file_path)
+    if compression is not None:
+        return CompressedDocument(file_path, compression, build_index=build_index)
+    return MappedDocument(file_path, build_index=build_index)
+
+
+class FilteredDocument:
+    """The lines of a MappedDocument that match a pattern, like less's &pattern
+
+    No text is copied. The view is an array('Q') of the source line numbers
+    that match, next to an array('Q') of their byte offsets, filled in
+    lazily as pages ask for lines. It offers the line interface of
+    MappedDocument, so pagination, wrapping and rendering work on it
+    unchanged, while line numbers refer to the source file.
+    """
+
+    SCAN_LINES = 65536
+
+    def __init__(self, source, pattern, term):
+        self.source = source
+        self.pattern = pattern  # See compile_search_pattern()
+        self.term = term
+        self.file_path = source.file_path
+        self.encoding = source.encoding
+        self.source_lines = array('Q')  # 0-based source line of every matching line
+        self.line_starts = array('Q')  # Byte offset of every matching line
+        self.scanned_lines = 0  # Source lines tested so far
+
+    @property
+    def size(self):
+        return self.source.size
+
+    @property
+    def index_complete(self):
+        """True once every line of a fully indexed source has been tested"""
+        return self.source.index_complete and self.scanned_lines >= self.source.line_count
+
+    @property
+    def line_count(self):
+        """Number of matching lines found so far"""
+        return len(self.source_lines)
+
+    @property
+    def estimated_line_count(self):
+        """Matching lines found so far, extrapolated over the untested bytes"""
+        found = len(self.source_lines)
+        if self.index_complete or not self.scanned_lines:
+            return found
+        source = self.source
+        if self.scanned_lines < len(source.line_starts):
+            scanned_bytes = source.line_starts[self.scanned_lines]
+        else:
+            scanned_bytes = source.size
+        return int(found * source.size / max(scanned_bytes, 1))
+
+    def scan_more(self, max_lines=SCAN_LINES):
+        """Test the next max_lines source lines; return False when there are none"""
+        source = self.source
+        start = self.scanned_lines
+        end = min(start + max_lines, source.line_count)
+        if start >= end:
+            return False
+
+        line_starts = source.line_starts
+        base, byte_end = source.line_byte_range(start, end)
+        data = source.read(base, byte_end)
+        if isinstance(self.pattern.pattern, str):
+            chunk = DecodedChunk(data, 0, len(data), source.encoding)
+            data, byte_offset, text_index = chunk.text, chunk.byte_offset, chunk.text_index
+        else:
+            byte_offset = text_index = int  # A bytes pattern matches the bytes themselves
+        search = self.pattern.search
+        pos = 0
+        while True:
+            # One search per matching line; the lines in between are
+            # skipped by the regex engine
+            match = search(data, pos)
+            if match is None:
+                break
+            line = bisect_right(line_starts, base + byte_offset(match.start()), start, end) - 1
+            self.source_lines.append(line)
+            self.line_starts.append(line_starts[line])
+            if line + 1 >= end:
+                break
+            pos = text_index(line_starts[line + 1] - base)
+        self.scanned_lines = end
+        return True
+
+    def ensure_lines(self, count):
+        """Test source lines until count matching lines are known or none are left"""
+        while len(self.source_lines) < count and self.scan_more():
+            pass
+
+    def line_number(self, line_index):
+        """Return the 1-based source line number of a 0-based filtered line"""
+        return self.source_lines[line_index] + 1
+
+    def view_line_for_source(self, source_line):
+        """Return the first filtered line at or after a 0-based source line"""
+        while self.scanned_lines <= source_line and self.scan_more():
+            pass
+        return bisect_left(self.source_lines, source_line)
+
+    def line_for_offset(self, offset):
+        """Return the filtered line holding a byte offset, or None if that line is hidden"""
+        source_line = self.source.line_for_offset(offset)
+        index = self.view_line_for_source(source_line)
+        if index < len(self.source_lines) and self.source_lines[index] == source_line:
+            return index
+        return None
+
+    def discard_from_source_line(self, source_line):
+        """Forget the results from a source line on, e.g. after it grew; return its filtered line"""
+        index = bisect_left(self.source_lines, source_line)
+        del self.source_lines[index:]
+        del self.line_starts[index:]
+        self.scanned_lines = min(self.scanned_lines, source_line)
+        return index
+
+    def decode(self, start, end):
+        return self.source.decode(start, end)
+
+    def line_size(self, line_index):
+        return self.source.line_size(self.source_lines[line_index])
+
+    def decode_line_span(self, line_index, start, end):
+        return self.source.decode_line_span(self.source_lines[line_index], start, end)
+
+    def column_for_offset(self, line_index, offset):
+        return self.source.column_for_offset(self.source_lines[line_index], offset)
+
+    def get_lines(self, start_line=0, end_line=None, max_chars=None):
+        """Return the text of filtered lines [start_line, end_line) as a list"""
+        self.ensure_lines(sys.maxsize if end_line is None else end_line)
+        end_line = self.line_count if end_line is None else min(end_line, self.line_count)
+        get_lines = self.source.get_lines
+        return [get_lines(line, line + 1, max_chars)[0] for line in self.source_lines[start_line:end_line]]
+
+
+class FileLoader(QThread):
+    """Open a document (see open_document()) and build its line index off the GUI thread
+
+    Given an already open document, only the part of the index that is
+    missing is built; follow mode uses this to index appended data.
+
+    With a ReadingStateCache, the saved reading state of the file is looked
+    up too (see reading_state); a saved line index replaces indexing and a
+    saved wrap layout is handed over as wrap_paginator.
+    """
+
+    first_page_ready = pyqtSignal()
+    progress = pyqtSignal(int)
+    finished_loading = pyqtSignal()
+    cancelled = pyqtSignal()
+    failed = pyqtSignal(str)
+    truncated = pyqtSignal()  # The file shrank while it was being indexed
+
+    # Index a small first chunk so page 1 can be shown almost immediately
+    FIRST_CHUNK_BYTES = 256 * 1024
+    CHUNK_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, file_path, parent=None, document=None, state_cache=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.document = document
+        self.state_cache = state_cache
+        self.file_key = None  # (size, mtime_ns) of the file when it was opened
+        self.reading_state = None  # Entry saved in state_cache, if any
+        self.wrap_paginator = None
+
+    def restore_reading_state(self, document):
+        """Look up the saved state of the file; return True if its line index was restored"""
+        try:
+            self.file_key = ReadingStateCache.file_key(self.file_path)
+        except OSError:
+            return False
+        self.reading_state = self.state_cache.load(self.file_path, self.file_key)
+        if self.reading_state is None or not self.state_cache.load_index(self.reading_state, document):
+            return False
+        self.wrap_paginator = self.state_cache.load_wrap(self.reading_state, document)
+        return True
+
+    @profiled('index_file')
+    def run(self):
+        """Map the file and index it chunk by chunk, reporting progress"""
+        document = self.document
+        if document is None:
+            try:
+                document = self.document = open_document(self.file_path, build_index=False)
+            except Exception as e:
+                self.failed.emit(str(e))
+                return
+
+            if self.state_cache is not None and self.restore_reading_state(document):
+                complete = True
+            else:
+                complete = document.index_more(self.FIRST_CHUNK_BYTES)
+            self.first_page_ready.emit()
+        else:
+            complete = document.index_complete
+
+        while not complete:
+            if self.isInterruptionRequested():
+                self.cancelled.emit()
+                return
+            if document.shrunk():
+                self.truncated.emit()
+                return
+            complete = document.index_more(self.CHUNK_BYTES)
+            self.progress.emit(document.index_progress)
+
+        self.finished_loading.emit()
+
+
+@lru_cache(maxsize=32)
+def compile_search_pattern(term, encoding='utf-8', regex=False, ignore_case=False, whole_word=False):
+    """Compile a search term into a pattern for scanning a MappedDocument
+
+    A plain, case-sensitive ASCII term is a bytes pattern matched against
+    the undecoded file, which is exact in every ASCII-compatible encoding.
+    Anything else needs to see characters: '.', '\\w', '\\b' and ignoring
+    case all go wrong on the bytes of non-ASCII text, and in UTF-16 and
+    UTF-32 even '^' would become different code units. Those stay str
+    patterns, and the bytes are decoded a chunk at a time to match them
+    (see DecodedChunk).
+
+    Patterns are compiled once per term and options, so repeating a search
+    with n/N or on another file reuses them. Raises re.error for an invalid
+    regular expression.
+    """
+    pattern = term if regex else re.escape(term)
+    if whole_word:
+        pattern = r'\b(?:' + pattern + r')\b'
+    if not (regex or ignore_case or whole_word) and term.isascii() and len('\n'.encode(encoding)) == 1:
+        pattern = pattern.encode(encoding)
+    flags = re.MULTILINE
+    if ignore_case:
+        flags |= re.IGNORECASE
+    return re.compile(pattern, flags)
+
+
+class DecodedChunk:
+    """Bytes decoded for a str pattern, with the way back to byte offsets
+
+    A UTF-32 character is always one code unit. A UTF-16 character outside
+    the Basic Multilingual Plane takes two, so the positions of those are
+    kept and the text indexes of matches still map to file offsets in
+    O(log n). Invalid code units decode to one character each, so they
+    cannot shift the offsets either.
+
+    In UTF-8 a character takes one to four bytes. Unless the chunk is all
+    ASCII, offsets are counted by re-encoding the text from the last one
+    looked up, which is cheap as matches and line starts are looked up in
+    file order. Invalid bytes decode to one character each and encode back
+    to themselves (surrogateescape), so the count stays exact. Single-byte
+    code pages are always one byte per character.
+    """
+
+    def __init__(self, data, start, end, encoding):
+        self.unit = len('\n'.encode(encoding))
+        end -= (end - start) % self.unit  # A code unit cut off at the end of the file
+        self.start = start  # File offset of data[start]
+        self.pair_indexes = array('Q')  # Text index of every surrogate pair
+        self.pair_units = array('Q')  # Code unit index of every surrogate pair
+        if self.unit == 1:
+            self.text = str(data[start:end], encoding, 'surrogateescape')
+            self.fixed_width = len(self.text) == end - start  # Every character is one code unit
+            if not self.fixed_width:
+                self.data = data
+                self.encoding = encoding
+                self.known = (0, start)  # (text index, offset) of the last lookup
+                self.byte_offset = self.count_bytes
+                self.text_index = self.count_characters
+            return
+        errors = 'surrogatepass' if self.unit == 2 else 'replace'
+        self.text = data[start:end].decode(encoding, errors)
+        if len(self.text) * self.unit != end - start:
+            for count, match in enumerate(ASTRAL_CHARACTERS.finditer(self.text)):
+                self.pair_indexes.append(match.start())
+                self.pair_units.append(match.start() + count)
+        self.fixed_width = not self.pair_indexes
+
+    def byte_offset(self, index):
+        """Return the offset of the character at a text index"""
+        return self.start + self.unit * (index + bisect_left(self.pair_indexes, index))
+
+    def text_index(self, offset):
+        """Return the text index of the character starting at an offset"""
+        unit = (offset - self.start) // self.unit
+        return unit - bisect_left(self.pair_units, unit)
+
+    def count_bytes(self, index):
+        """byte_offset() for UTF-8 text with non-ASCII characters"""
+        known_index, known_offset = self.known
+        if index < known_index:
+            known_index, known_offset = 0, self.start
+        offset = known_offset + len(self.text[known_index:index].encode(self.encoding, 'surrogateescape'))
+        self.known = (index, offset)
+        return offset
+
+    def count_characters(self, offset):
+        """text_index() for UTF-8 text with non-ASCII characters"""
+        known_index, known_offset = self.known
+        if offset < known_offset:
+            known_index, known_offset = 0, self.start
+        index = known_index + len(str(self.data[known_offset:offset], self.encoding, 'surrogateescape'))
+        self.known = (index, offset)
+        return index
+
+
+def next_line_start(data, pos, end, newline=b'\n'):
+    """Return the offset after the first line break in data[pos:end], or end if there is none
+
+    For multi-byte code units, only a line break at a code unit boundary
+    counts, not one inside another character.
+    """
+    width = len(newline)
+    pos = data.find(newline, pos, end)
+    while pos != -1 and pos % width:
+        pos = data.find(newline, pos + 1, end)
+    return end if pos == -1 else pos + width
+
+
+def iter_pattern_matches(data, pattern, start, end, chunk_bytes=4 * 1024 * 1024, encoding='utf-8'):
+    """Find the matches of a compiled pattern that start in data[start:end], a chunk at a time
+
+    Yields (starts, lengths, next_pos) for each chunk, where next_pos is
+    where the following chunk starts; every match starting before it is
+    known. Chunks end after a line break. A match may run on past its
+    chunk, and past end, by up to MATCH_LOOKAHEAD_BYTES: each chunk is
+    matched up to the line break after that, so '$' only matches at line
+    ends, and the next chunk resumes after the match. Empty matches are
+    skipped; they have nothing to show.
+
+    A str pattern is matched against each chunk decoded, so start must be
+    a character boundary.
+    """
+    finditer = pattern.finditer
+    decoded = isinstance(pattern.pattern, str)
+    newline = '\n'.encode(encoding)
+    limit = len(data)
+    pos = start
+    while pos < end:
+        cut = next_line_start(data, min(pos + chunk_bytes, end), end, newline)
+        window_end = next_line_start(data, min(cut + MATCH_LOOKAHEAD_BYTES, limit), limit, newline)
+
+        starts = array('Q')
+        lengths = array('I')
+        last_end = cut
+        if decoded:
+            # From one character back, so '^' and '\b' see what precedes pos
+            context = max(pos - len(newline), 0)
+            while len(newline) == 1 and context > 0 and pos - context < 4 and data[context] & 0xC0 == 0x80:
+                context -= 1  # Back to the first byte of a UTF-8 character
+            chunk = DecodedChunk(data, context, window_end, encoding)
+            text_pos = chunk.text_index(pos)
+            text_cut = chunk.text_index(cut)
+            if chunk.fixed_width:
+                # Offsets are plain arithmetic; no lookups per match
+                base, unit = chunk.start, chunk.unit
+                for match in finditer(chunk.text, text_pos):
+                    match_start, match_end = match.span()
+                    if match_start >= text_cut:
+                        break  # Found again by the next chunk
+                    if match_end > match_start:
+                        starts.append(base + unit * match_start)
+                        lengths.append(unit * (match_end - match_start))
+                        last_end = base + unit * match_end
+            else:
+                byte_offset = chunk.byte_offset
+                for match in finditer(chunk.text, text_pos):
+                    match_start, match_end = match.span()
+                    if match_start >= text_cut:
+                        break  # Found again by the next chunk
+                    if match_end > match_start:
+                        match_start = byte_offset(match_start)
+                        last_end = byte_offset(match_end)
+                        starts.append(match_start)
+                        lengths.append(last_end - match_start)
+        else:
+            for match in finditer(data, pos, window_end):
+                match_start, match_end = match.span()
+                if match_start >= cut:
+                    break  # Found again by the next chunk
+                if match_end > match_start:
+                    starts.append(match_start)
+                    lengths.append(match_end - match_start)
+                    last_end = match_end
+        pos = max(cut, last_end)
+        yield starts, lengths, pos
+
+
+def search_file_range(file_path, pattern, start, end, encoding='utf-8'):
+    """Return the (starts, lengths) of the matches in bytes [start, end) of a file
+
+    Runs in a worker process of a parallel search. The worker maps the file
+    itself, so all processes share the same pages of the OS file cache.
+    """
+    starts = array('Q')
+    lengths = array('I')
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for chunk_starts, chunk_lengths, _ in iter_pattern_matches(data, pattern, start, end, encoding=encoding):
+                starts.extend(chunk_starts)
+                lengths.extend(chunk_lengths)
+    return starts, lengths
+
+
+class SearchEngine(QThread):
+    """Find every match of a search pattern in a document off the GUI thread
+
+    The mapped bytes are matched front to back, decoded only for patterns
+    that need characters (see compile_search_pattern()), and the byte
+    offsets of the matches are appended to an array('Q') in sorted order.
+    The GUI can bisect the array for the next or previous match while the
+    scan is still running.
+
+    Large files are split into line-aligned byte ranges that are searched
+    in parallel by a process pool. Ranges are published in file order, so
+    the array stays sorted; first_hit reports the first match from origin
+    on as soon as it is known, before the ranges ahead of it are done.
+    """
+
+    matches_found = pyqtSignal(int)  # Number of matches found so far
+    first_hit = pyqtSignal(int, int)  # Offset and byte length of the first match from origin
+    finished_searching = pyqtSignal()
+    truncated = pyqtSignal()  # The file shrank; the search stopped
+    parallel_failed = pyqtSignal(str)  # The process pool failed; the search goes on in this thread
+
+    CHUNK_BYTES = 4 * 1024 * 1024
+    # Files at least this big are searched by a process pool
+    PARALLEL_MIN_BYTES = 256 * 1024 * 1024
+    RANGE_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, document, pattern, term, parent=None, origin=0):
+        super().__init__(parent)
+        self.document = document
+        self.pattern = pattern  # See compile_search_pattern()
+        self.term = term
+        self.origin = origin  # Where the user's search starts
+        self.matches = array('Q')
+        self.match_lengths = array('I')  # Byte length of each match
+        self.searched_bytes = 0  # Every match starting before this is known
+        self.complete = False
+
+    @profiled('search')
+    def run(self):
+        """Scan the document, publishing the matches as they are found"""
+        if isinstance(self.document, CompressedDocument):
+            searched = self.search_compressed()
+        else:
+            searched = self.search_mapped()
+        if not searched:
+            return
+
+        self.complete = True
+        self.finished_searching.emit()
+
+    def search_mapped(self):
+        """Scan the mapped bytes of the file; return False if interrupted
+
+        Reading the map of a file that has been truncated raises SIGBUS, so
+        the size is checked before each chunk and a shrunk file stops the
+        search with truncated.
+        """
+        data = self.document.buffer
+        size = len(data)
+        # Only the CPUs this process may run on, e.g. under taskset or in a container
+        if hasattr(os, 'sched_getaffinity'):
+            workers = len(os.sched_getaffinity(0))
+        else:
+            workers = os.cpu_count() or 1
+        if size >= self.PARALLEL_MIN_BYTES and workers > 1:
+            from concurrent.futures.process import BrokenProcessPool
+            try:
+                if not self.search_parallel(data, size, workers):
+                    return False
+            except (BrokenProcessPool, OSError) as e:
+                # No worker processes (e.g. a restricted sandbox) or one
+                # died; what was published so far is kept and the rest is
+                # scanned here
+                self.parallel_failed.emit(str(e) or type(e).__name__)
+
+        if self.stop_if_truncated():
+            return False
+        for starts, lengths, searched_bytes in iter_pattern_matches(data, self.pattern, self.searched_bytes, size,
+                                                                    self.CHUNK_BYTES, self.document.encoding):
+            if self.isInterruptionRequested() or self.stop_if_truncated():
+                return False
+            self.publish(starts, lengths, searched_bytes)
+        return True
+
+    def stop_if_truncated(self):
+        """Report a file that shrank since it was mapped; return True if it did"""
+        if not self.document.shrunk():
+            return False
+        self.truncated.emit()
+        return True
+
+    def search_compressed(self):
+        """Decompress the file front to back in this thread and scan it; return False if interrupted"""
+        chunks = self.document.iter_chunks(self.CHUNK_BYTES)
+        chunk = next(chunks, None)
+        pos = 0  # Where the next match can start; a match may run into the next chunk
+        while chunk is not None:
+            if self.isInterruptionRequested():
+                return False
+            offset, data = chunk
+            end = len(data)
+            chunk = next(chunks, None)
+            if chunk is not None:
+                data += chunk[1]  # Matches may run up to MATCH_LOOKAHEAD_BYTES into it
+            for starts, lengths, next_pos in iter_pattern_matches(data, self.pattern, pos - offset, end, end,
+                                                                  self.document.encoding):
+                self.publish(array('Q', [start + offset for start in starts]), lengths, offset + next_pos)
+                pos = offset + next_pos
+        return True
+
+    def publish(self, starts, lengths, searched_bytes):
+        """Append the matches of the next stretch of the document"""
+        if self.matches:
+            # Ranges are searched on their own, and a match may run into the next one
+            overlapped = bisect_left(starts, self.matches[-1] + self.match_lengths[-1])
+            if overlapped:
+                starts, lengths = starts[overlapped:], lengths[overlapped:]
+        # Lengths first: the GUI thread reads them by index into matches
+        self.match_lengths.extend(lengths)
+        self.matches.extend(starts)
+        self.searched_bytes = searched_bytes
+        self.matches_found.emit(len(self.matches))
+
+    def split_ranges(self, data, size):
+        """Split [0, size) into ranges of about RANGE_BYTES that end after line breaks"""
+        ranges = []
+        pos = 0
+        while pos < size:
+            end = next_line_start(data, min(pos + self.RANGE_BYTES, size), size, self.document.newline)
+            ranges.append((pos, end))
+            pos = end
+        return ranges
+
+    def search_parallel(self, data, size, workers):
+        """Search line-aligned ranges in a process pool; return False if interrupted"""
+        import multiprocessing
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+        
+        if self.stop_if_truncated():
+            return False
+        ranges = self.split_ranges(data, size)
+        # Workers are spawned rather than forked from this threaded Qt process
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(ranges)),
+                                       mp_context=multiprocessing.get_context('spawn'))
+        try:
+            futures = {
+                executor.submit(search_file_range, self.document.file_path, self.pattern, start, end,
+                                self.document.encoding): index
+                for index, (start, end) in enumerate(ranges)
+            }
+            results = [None] * len(ranges)
+            range_first_hits = {}
+            origin_range = max(bisect_right([start for start, _ in ranges], self.origin) - 1, 0)
+            first_hit_sent = False
+            published = 0
+            pending = set(futures)
+            while pending:
+                if self.isInterruptionRequested() or self.stop_if_truncated():
+                    return False
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = futures[future]
+                    starts, lengths = results[index] = future.result()
+                    hit = bisect_left(starts, self.origin)
+                    range_first_hits[index] = (starts[hit], lengths[hit]) if hit < len(starts) else None
+
+                # The first match from origin on is known once every range
+                # from the origin's up to the one holding it is done
+                index = origin_range
+                while not first_hit_sent and index in range_first_hits:
+                    if range_first_hits[index] is not None:
+                        self.first_hit.emit(*range_first_hits[index])
+                        first_hit_sent = True
+                    index += 1
+
+                # Publish finished ranges in file order
+                while published < len(ranges) and results[published] is not None:
+                    starts, lengths = results[published]
+                    results[published] = ()
+                    self.publish(starts, lengths, ranges[published][1])
+                    published += 1
+            return True
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class WrapPaginator:
+    """Lazily computed word-wrap pagination for a MappedDocument
+
+    Text lines are wrapped a chunk at a time, and only as far as the pages
+    that have actually been requested. The page count past the wrapped
+    region is estimated from the wrap ratio seen so far, so opening,
+    resizing or zooming a huge file never wraps its tail until the reader
+    gets there.
+
+    Wrapped lines are not stored as strings. Each visual line is an entry
+    in two flat arrays: the 1-based text line it belongs to, and its
+    (start, end) character span within that line. A page is rebuilt by
+    decoding its text lines and slicing them.
+
+    A text line longer than MappedDocument.LONG_LINE_BYTES is never decoded
+    whole. It is wrapped WRAP_PIECE_CHARS at a time, and only until the
+    requested visual lines are known, so the first page of a file that is
+    one line of a hundred megabytes wraps one piece of it.
+    """
+
+    CHUNK_LINES = 1024
+    WRAP_PIECE_CHARS = 64 * 1024
+
+    def __init__(self, document, chars_per_line, visual_lines_per_page):
+        self.document = document
+        self.chars_per_line = chars_per_line
+        self.visual_lines_per_page = visual_lines_per_page
+
+        self.visual_to_text_line_map = array('I')
+        self.visual_line_spans = array('I')  # Flattened (start, end) pairs
+        self.chunk_line_counts = []
+        # First visual line of every chunk, followed by the running total
+        self.chunk_visual_starts = [0]
+        self.wrapped_line_count = 0  # Text lines wrapped to the end
+        self.chunk_end_line = None  # End of a chunk wrapped part of the way
+        self.line_progress = None  # (position, skipping whitespace) in a long line wrapped part of the way
+
+    def copy(self):
+        """Return a copy of the whole chunks wrapped so far, which further wrapping leaves unchanged
+
+        E.g. for saving it. A chunk still in progress is left out.
+        """
+        paginator = WrapPaginator(self.document, self.chars_per_line, self.visual_lines_per_page)
+        visual_line_count = self.chunk_visual_starts[-1]
+        paginator.visual_to_text_line_map = self.visual_to_text_line_map[:visual_line_count]
+        paginator.visual_line_spans = self.visual_line_spans[:2 * visual_line_count]
+        paginator.chunk_line_counts = list(self.chunk_line_counts)
+        paginator.chunk_visual_starts = list(self.chunk_visual_starts)
+        if self.chunk_end_line is None:
+            paginator.wrapped_line_count = self.wrapped_line_count
+        else:
+            paginator.wrapped_line_count = len(self.chunk_line_counts) * self.CHUNK_LINES
+        return paginator
+
+    def matches(self, document, chars_per_line, visual_lines_per_page):
+        """Check whether this paginator is still valid for the given layout"""
+        return (self.document is document and
+                self.chars_per_line == chars_per_line and
+                self.visual_lines_per_page == visual_lines_per_page)
+
+    @property
+    def is_complete(self):
+        """True once every line of a fully indexed document has been wrapped"""
+        return (self.document.index_complete and
+                self.wrapped_line_count >= self.document.line_count)
+
+    @property
+    def total_pages(self):
+        """Exact page count once complete, otherwise an estimate"""
+        visual_line_count = len(self.visual_to_text_line_map)
+        if not self.is_complete:
+            wrapped = self.wrapped_line_count
+            if self.line_progress is not None:
+                # The share of the long line wrapped so far, taking a character as one code unit
+                unit = len('\n'.encode(self.document.encoding))
+                wrapped += min(unit * self.line_progress[0] / max(self.document.line_size(wrapped), 1), 1)
+            remaining = max(self.document.estimated_line_count - wrapped, 0)
+            ratio = visual_line_count / wrapped if wrapped else 1.0
+            visual_line_count += int(remaining * ratio)
+        return max(1, -(-visual_line_count // self.visual_lines_per_page))
+
+    def wrap_spans(self, text_line):
+        """Return the (start, end) spans of the visual lines for one text line
+
+        Lines break after the last whitespace or hyphen that fits, or
+        mid-word when there is none. Whitespace at a break is dropped.
+        """
+        if not text_line.strip():  # Empty line
+            return [(0, 0)]
+        spans = []
+        self.wrap_text(text_line, 0, spans)
+        return spans
+
+    def wrap_text(self, text_line, pos, spans, first=0, final=True, skip=False):
+        """Append the spans of the visual lines of text_line from pos on; return where it stopped
+
+        The spans are offset by first, the position of text_line in its line.
+        Unless final, text_line is only a piece of a long line: wrapping
+        stops at the first visual line that could still take characters
+        from the next piece, or in the whitespace after a break, which the
+        next piece goes on skipping when skip is set.
+        """
+        length = len(text_line)
+        width = self.chars_per_line
+        if skip:
+            while pos < length and text_line[pos] in ' \t':
+                pos += 1
+        while pos < length:
+            end = pos + width
+            if end >= length:
+                if final:
+                    spans.append((first + pos, first + length))
+                break
+
+            # Prefer breaking at whitespace, then after a hyphen
+            brk = max(text_line.rfind(' ', pos + 1, end + 1), text_line.rfind('\t', pos + 1, end + 1))
+            if brk > pos:
+                next_pos = brk + 1
+            else:
+                hyphen = text_line.rfind('-', pos + 1, end)
+                brk = next_pos = hyphen + 1 if hyphen > pos else end
+
+            # Drop whitespace around the break
+            while brk > pos and text_line[brk - 1] in ' \t':
+                brk -= 1
+            spans.append((first + pos, first + brk))
+            pos = next_pos
+            while pos < length and text_line[pos] in ' \t':
+                pos += 1
+        return pos
+
+    def wrap_next_chunk(self, visual_limit=None):
+        """Wrap the next chunk of text lines; return False at the end of the index
+
+        A chunk holding a long line stops part of the way through it once
+        visual_limit visual lines are known; the next call carries on.
+        """
+        if self.chunk_end_line is None:
+            # A trailing chunk cut short by a still-growing index is re-wrapped
+            if self._has_stale_tail():
+                self.discard_from_line((len(self.chunk_line_counts) - 1) * self.CHUNK_LINES)
+
+            start_line = len(self.chunk_line_counts) * self.CHUNK_LINES
+            self.document.ensure_lines(start_line + self.CHUNK_LINES)
+            self.chunk_end_line = min(start_line + self.CHUNK_LINES, self.document.line_count)
+            if start_line >= self.chunk_end_line:
+                self.chunk_end_line = None
+                return False
+
+        document = self.document
+        end_line = self.chunk_end_line
+        line_map = self.visual_to_text_line_map
+        spans = self.visual_line_spans
+        while self.wrapped_line_count < end_line:
+            line = self.wrapped_line_count
+            if self.line_progress is not None or document.line_size(line) > MappedDocument.LONG_LINE_BYTES:
+                if not self.wrap_long_line(line, visual_limit):
+                    return True  # Enough for now
+                continue
+
+            # The short lines up to the next long one are decoded together
+            short_end = line + 1
+            while short_end < end_line and document.line_size(short_end) <= MappedDocument.LONG_LINE_BYTES:
+                short_end += 1
+            for text_line_num, text_line in enumerate(document.get_lines(line, short_end),
+                                                      line + 1):  # 1-based line numbers
+                for start, end in self.wrap_spans(text_line):
+                    line_map.append(text_line_num)
+                    spans.append(start)
+                    spans.append(end)
+            self.wrapped_line_count = short_end
+
+        self.chunk_line_counts.append(end_line - len(self.chunk_line_counts) * self.CHUNK_LINES)
+        self.chunk_visual_starts.append(len(line_map))
+        self.chunk_end_line = None
+        return True
+
+    def wrap_long_line(self, line, visual_limit=None):
+        """Wrap a long 0-based text line a piece at a time; return True once it is done
+
+        Stops early, keeping its place in line_progress, once visual_limit
+        visual lines are known.
+        """
+        line_map = self.visual_to_text_line_map
+        spans = self.visual_line_spans
+        pos, skip = self.line_progress or (0, False)
+        piece = self.WRAP_PIECE_CHARS
+        while True:
+            first, text = self.document.decode_line_span(line, pos, pos + piece)
+            # A window that ends before the piece does is the end of the line
+            final = first + len(text) < pos + piece
+            if not final:
+                text = text[:pos + piece - first]  # Past that, a character may be cut off
+            piece_spans = []
+            stop = self.wrap_text(text, pos - first, piece_spans, first, final, skip)
+            for start, end in piece_spans:
+                line_map.append(line + 1)
+                spans.append(start)
+                spans.append(end)
+            if final:
+                self.line_progress = None
+                self.wrapped_line_count = line + 1
+                return True
+            pos, skip = first + stop, stop >= len(text)
+            self.line_progress = (pos, skip)
+            if visual_limit is not None and len(line_map) >= visual_limit:
+                return False
+
+    def ensure_visual_lines(self, count):
+        """Wrap chunks until at least count visual lines are known"""
+        while len(self.visual_to_text_line_map) < count or self._has_stale_tail():
+            if not self.wrap_next_chunk(count):
+                break
+
+    def discard_from_line(self, line_index):
+        """Forget the wrapping of the chunk holding a 0-based text line and all later ones"""
+        chunk_index = line_index // self.CHUNK_LINES
+        if chunk_index > len(self.chunk_line_counts) or (
+                chunk_index == len(self.chunk_line_counts) and self.chunk_end_line is None):
+            return
+        visual_start = self.chunk_visual_starts[chunk_index]
+        del self.chunk_line_counts[chunk_index:]
+        del self.chunk_visual_starts[chunk_index + 1:]
+        del self.visual_to_text_line_map[visual_start:]
+        del self.visual_line_spans[2 * visual_start:]
+        self.wrapped_line_count = chunk_index * self.CHUNK_LINES
+        self.chunk_end_line = None
+        self.line_progress = None
+
+    def _has_stale_tail(self):
+        """Check whether the last chunk is partial and the index has grown since"""
+        return (self.chunk_line_counts and self.chunk_line_counts[-1] < self.CHUNK_LINES and
+                self.document.line_count > self.wrapped_line_count)
+
+    def first_line_of_page(self, page_number):
+        """Return the 0-based text line shown at the top of a page"""
+        start = (page_number - 1) * self.visual_lines_per_page
+        self.ensure_visual_lines(start + 1)
+        line_map = self.visual_to_text_line_map
+        if not line_map:
+            return 0
+        return line_map[min(start, len(line_map) - 1)] - 1
+
+    def page_for_line(self, line_index):
+        """Return the page holding the first visual line of a 0-based text line"""
+        line_map = self.visual_to_text_line_map
+        while (not line_map or line_map[-1] <= line_index) and self.wrap_next_chunk(len(line_map) + 1):
+            pass
+        visual_index = bisect_left(line_map, line_index + 1)
+        return visual_index // self.visual_lines_per_page + 1
+
+    def locate(self, line_index, column):
+        """Return (page, row, column) where a character of a 0-based text line is shown"""
+        self.page_for_line(line_index)  # Wraps up to the start of the line
+        line_map = self.visual_to_text_line_map
+        # A long line is wrapped only as far as the column
+        while (self.wrapped_line_count == line_index and self.line_progress is not None and
+               self.line_progress[0] <= column and self.wrap_next_chunk(len(line_map) + 1)):
+            pass
+        spans = self.visual_line_spans
+        # Binary search for the visual line of the line that the column falls in
+        visual_index = bisect_left(line_map, line_index + 1)
+        last = bisect_right(line_map, line_index + 1, visual_index) - 1
+        while visual_index < last:
+            middle = (visual_index + last + 1) // 2
+            if spans[2 * middle] <= column:
+                visual_index = middle
+            else:
+                last = middle - 1
+        start, end = spans[2 * visual_index], spans[2 * visual_index + 1]
+        column = min(max(column - start, 0), end - start)
+        return (visual_index // self.visual_lines_per_page + 1,
+                visual_index % self.visual_lines_per_page, column)
+
+    def get_page(self, page_number):
+        """Return [(text_line_number, visual_line), ...] for a page"""
+        start = (page_number - 1) * self.visual_lines_per_page
+        end = start + self.visual_lines_per_page
+        self.ensure_visual_lines(end)
+
+        line_map = self.visual_to_text_line_map[start:end]
+        if not line_map:
+            return []
+        spans = self.visual_line_spans[2 * start:2 * end]
+
+        # Decode just the text lines this page touches. Only the first and
+        # the last can go on past the page, and a long one is decoded only
+        # where the page shows it (see MappedDocument.decode_line_span()).
+        first_line, last_line = line_map[0], line_map[-1]
+        texts = {}
+        for line in {first_line, last_line}:
+            first = bisect_left(line_map, line)
+            last = bisect_right(line_map, line, first) - 1
+            texts[line] = self.document.decode_line_span(line - 1, spans[2 * first], spans[2 * last + 1])
+        if last_line - first_line > 1:
+            text_lines = self.document.get_lines(first_line, last_line - 1)
+            for line, text in enumerate(text_lines, first_line + 1):
+                texts[line] = (0, text)
+        return [
+            (line, texts[line][1][spans[2 * i] - texts[line][0]:spans[2 * i + 1] - texts[line][0]])
+            for i, line in enumerate(line_map)
+        ]
+
+
+class PageRenderCache:
+    """LRU cache of rendered page text, bounded by an approximate memory cap"""
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._pages = OrderedDict()
+
+    def get(self, key):
+        """Return the cached text for key, or None"""
+        text = self._pages.get(key)
+        if text is not None:
+            self._pages.move_to_end(key)
+        return text
+
+    def put(self, key, text):
+        """Cache text under key, evicting least recently used pages as needed"""
+        size = sys.getsizeof(text)
+        if size > self.max_bytes:
+            return
+        old_text = self._pages.pop(key, None)
+        if old_text is not None:
+            self.current_bytes -= sys.getsizeof(old_text)
+        self._pages[key] = text
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._pages.popitem(last=False)
+            self.current_bytes -= sys.getsizeof(evicted)
+
+    def __contains__(self, key):
+        return key in self._pages
+
+    def clear(self):
+        """Drop every cached page"""
+        self._pages.clear()
+        self.current_bytes = 0
+
+    def discard(self, predicate):
+        """Drop the cached pages whose key satisfies predicate"""
+        for key in [key for key in self._pages if predicate(key)]:
+            self.current_bytes -= sys.getsizeof(self._pages.pop(key))
+
+
+class PaginationModel:
+    """Document and page layout shared by the panes that display it
+
+    In two-page mode both LessTextEdit panes read their pages from one
+    model, so a file is paginated once per load, resize or zoom instead of
+    once per pane. Only the pane that owns the model paginates it.
+    """
+
+    def __init__(self):
+        self.document = None  # MappedDocument backing the view
+        self.word_wrap_enabled = True
+        self.lines_per_page = 0
+        self.visual_lines_per_page = 0
+        self.total_pages = 0
+        self.total_pages_exact = True  # False while the count is an estimate
+        self.wrap_paginator = None  # WrapPaginator used in word wrap mode
+        # Identifies the current page geometry for the render cache
+        self.layout_key = None
+        self.page_cache = PageRenderCache()
+
+    def paginate(self, viewport_size, font_metrics, word_wrap_enabled, current_page=1):
+        """Calculate pagination using visual lines for perfect viewport fitting"""
+        if self.document is None:
+            return
+
+        self.word_wrap_enabled = word_wrap_enabled
+        line_height = font_metrics.lineSpacing()
+
+        if not word_wrap_enabled:
+            # No-wrap mode: simple line-based pagination
+            self.lines_per_page = max(1, (viewport_size.height() - 40) // line_height)
+            self.layout_key = ('nowrap', self.lines_per_page)
+            self.update_page_count()
+            return
+
+        # For word wrap mode, use visual line-based pagination
+        viewport_height = viewport_size.height() - 40  # Leave margin
+        char_width = font_metrics.averageCharWidth()
+
+        # Calculate how many visual lines fit per page
+        visual_lines_per_page = max(1, viewport_height // line_height)
+
+        # Calculate viewport width in characters
+        viewport_width = viewport_size.width() - 40  # Account for margins
+        chars_per_line = max(1, viewport_width // char_width)
+
+        # Wrapping happens lazily as pages are requested; keep the already
+        # wrapped chunks when only the document grew (e.g. while loading)
+        paginator = self.wrap_paginator
+        if paginator is None or not paginator.matches(self.document, chars_per_line,
+                                                      visual_lines_per_page):
+            paginator = WrapPaginator(self.document, chars_per_line, visual_lines_per_page)
+            self.wrap_paginator = paginator
+
+        # Wrap at least the current page so the estimate has data to go on
+        paginator.ensure_visual_lines(current_page * visual_lines_per_page)
+        self.visual_lines_per_page = visual_lines_per_page
+        self.layout_key = ('wrap', chars_per_line, visual_lines_per_page)
+        self.update_wrapped_page_count()
+
+    def update_wrapped_page_count(self):
+        """Refresh the page count after the wrap paginator did more work"""
+        self.total_pages = self.wrap_paginator.total_pages
+        self.total_pages_exact = self.wrap_paginator.is_complete
+
+    def update_page_count(self):
+        """Refresh the page count after more of the document became available"""
+        if self.word_wrap_enabled and self.wrap_paginator is not None:
+            self.update_wrapped_page_count()
+            return
+        total_lines = self.document.estimated_line_count
+        self.total_pages = max(1, (total_lines + self.lines_per_page - 1) // self.lines_per_page)
+        self.total_pages_exact = self.document.index_complete
+
+    def paginate_to_end(self, max_lines=None):
+        """Paginate towards the end of the document; return the last page reached
+
+        In word wrap mode at most max_lines more lines are wrapped, so a
+        long stretch of new text can be caught up with over several calls.
+        """
+        paginator = self.wrap_paginator
+        if not self.word_wrap_enabled or paginator is None:
+            self.document.ensure_lines(sys.maxsize)
+            self.update_page_count()
+            return self.total_pages
+
+        limit = sys.maxsize if max_lines is None else paginator.wrapped_line_count + max_lines
+        while paginator.wrapped_line_count < limit and paginator.wrap_next_chunk():
+            pass
+        self.update_wrapped_page_count()
+        if paginator.is_complete:
+            return self.total_pages
+        return max(1, -(-len(paginator.visual_to_text_line_map) // paginator.visual_lines_per_page))
+
+    def discard_from_line(self, line_index):
+        """Forget pagination and rendered pages from a source line that may have changed
 
+        Used when data is appended to the document: the line that was last
+        may have been incomplete, so its pages and everything after them
+        are rebuilt while earlier pages stay cached.
+        """
+        paginator = self.wrap_paginator if self.word_wrap_enabled else None
+        if self.layout_key is None:
+            first_page = 1
+        elif paginator is not None and line_index >= paginator.wrapped_line_count:
+            # Pages past the wrapped lines have not been rendered yet
+            visual_index = bisect_left(paginator.visual_to_text_line_map, line_index + 1)
+            first_page = visual_index // paginator.visual_lines_per_page + 1
+        else:
+            first_page = self.page_for_line(line_index)
+        if self.wrap_paginator is not None:
+            self.wrap_paginator.discard_from_line(line_index)
+        # Pages cached for other layouts are not tracked; drop them all
+        layout_key = self.layout_key
+        self.page_cache.discard(lambda key: key[2] != layout_key or key[0] >= first_page)
 
-class FindDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Find")
-        self.setFixedSize(300, 100)
+    def first_line_of_page(self, page_number):
+        """Return the 0-based source line at the top of a page"""
+        if self.word_wrap_enabled and self.wrap_paginator is not None:
+            return self.wrap_paginator.first_line_of_page(page_number)
+        return max(page_number - 1, 0) * self.lines_per_page
 
-        self.layout = QVBoxLayout(self)
-        self.find_input = QLineEdit(self)
-        self.layout.addWidget(self.find_input)
+    def page_for_line(self, line_index):
+        """Return the page on which a 0-based source line starts"""
+        if self.word_wrap_enabled and self.wrap_paginator is not None:
+            return self.wrap_paginator.page_for_line(line_index)
+        return line_index // max(self.lines_per_page, 1) + 1
 
-        self.button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel, self)
-        self.button_box.accepted.connect(self.accept)
-        self.button_box.rejected.connect(self.reject)
-        self.layout.addWidget(self.button_box)
+    def page_byte_range(self, page_number):
+        """Return a (start, end) byte range covering every source line shown on a page"""
+        first_line = self.first_line_of_page(page_number)
+        if self.word_wrap_enabled and self.wrap_paginator is not None:
+            # The line at the top of the next page may start on this one
+            end_line = self.first_line_of_page(page_number + 1) + 1
+        else:
+            end_line = first_line + self.lines_per_page
+
+        line_starts = self.document.line_starts
+        if first_line >= len(line_starts):
+            return self.document.size, self.document.size
+        start = line_starts[first_line]
+        end = line_starts[end_line] if end_line < len(line_starts) else self.document.size
+        return start, end
+
+    def locate_offset(self, offset):
+        """Return (page, row, column) where a byte offset of the document is shown
+
+        The row counts the lines of the page text and the column its
+        characters, not including a line number prefix.
+        """
+        document = self.document
+        line_index = document.line_for_offset(offset)
+        column = document.column_for_offset(line_index, offset)
+        if self.word_wrap_enabled and self.wrap_paginator is not None:
+            return self.wrap_paginator.locate(line_index, column)
+        lines_per_page = max(self.lines_per_page, 1)
+        return line_index // lines_per_page + 1, line_index % lines_per_page, column
 
-    def text(self):
-        return self.find_input.text()
 
-class LessTextEdit(QTextEdit):
-    """Custom QTextEdit with less-like functionality and zoom support"""
+class LessTextEdit(QPlainTextEdit):
+    """Read-only page view with less-like functionality and zoom support
+
+    Built on QPlainTextEdit, which lays out only the blocks that are
+    visible and, with undo disabled, keeps no history, so replacing the
+    page text costs the same at any file size. The widget only ever holds
+    one page; the document itself stays in the PaginationModel.
+    """
+    
+    # Emitted on resize; the owner debounces it and repaginates
+    viewport_resized = pyqtSignal()
+    # Emitted when the file shrank under the page being rendered; the owner reloads it
+    source_truncated = pyqtSignal()
+    
+    # Without word wrap, lines are cut here rather than decoded and laid
+    # out for columns far past any scroll position anyone reads at
+    NOWRAP_LINE_CHARS = 16 * 1024
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
         # Line wrap will be set after word_wrap_enabled is initialized
         
         # Set up font
@@ -446,13 +2389,53 @@ class LessTextEdit(QTextEdit):
         
         # Word wrap state
         self.word_wrap_enabled = True  # Enable word wrap by default
-        self.setLineWrapMode(QTextEdit.WidgetWidth if self.word_wrap_enabled else QTextEdit.NoWrap)
+        self.setLineWrapMode(QPlainTextEdit.WidgetWidth if self.word_wrap_enabled else QPlainTextEdit.NoWrap)
         
-        # Pagination support
-        self.original_content = ""
+        # Pagination support; the model may be shared with another pane
+        self.pagination = PaginationModel()
+        self.owns_pagination = True
         self.current_page = 1
-        self.lines_per_page = 0
-        self.total_pages = 0
+        
+        # Search matches on the page are highlighted in this format
+        self.match_format = QTextCharFormat()
+    
+    @property
+    def source_document(self):
+        """MappedDocument backing the view"""
+        return self.pagination.document
+    
+    @source_document.setter
+    def source_document(self, document):
+        self.pagination.document = document
+    
+    @property
+    def total_pages(self):
+        return self.pagination.total_pages
+    
+    @total_pages.setter
+    def total_pages(self, total_pages):
+        self.pagination.total_pages = total_pages
+    
+    @property
+    def lines_per_page(self):
+        return self.pagination.lines_per_page
+    
+    @lines_per_page.setter
+    def lines_per_page(self, lines_per_page):
+        self.pagination.lines_per_page = lines_per_page
+    
+    @property
+    def total_pages_exact(self):
+        return self.pagination.total_pages_exact
+    
+    @property
+    def wrap_paginator(self):
+        return self.pagination.wrap_paginator
+    
+    def share_pagination(self, pagination):
+        """Display pages from another pane's model instead of paginating here"""
+        self.pagination = pagination
+        self.owns_pagination = False
         
     def wheelEvent(self, event):
         """Handle Ctrl+Scroll wheel for zooming"""
@@ -489,23 +2472,35 @@ class LessTextEdit(QTextEdit):
         font = self.font()
         font.setPointSize(new_size)
         self.setFont(font)
+        # A new font size changes how much text fits on a page
+        if self.source_document is not None:
+            self.viewport_resized.emit()
     
+    @profiled('load_file')
     def load_file(self, file_path):
-        """Load and display a text file"""
+        """Map a text file and display its first page"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as file:
-                content = file.read()
-                self.original_content = content
-                self.setPlainText(content)
-                self.calculate_pagination()
-                return True
+            document = open_document(file_path)
         except Exception as e:
             QMessageBox.critical(self.parent(), "Error", f"Failed to open file: {str(e)}")
             return False
+
+        self.set_source_document(document)
+        return True
+    
+    def set_source_document(self, document):
+        """Display an already opened (possibly still indexing) document"""
+        self.source_document = document
+        self.pagination.page_cache.clear()
+        self.current_page = 1
+        self.calculate_pagination()
+        self.set_page_content(1)
     
+    @profiled('calculate_pagination')
     def calculate_pagination(self):
         """Calculate pagination using viewport-based content fitting"""
-        if not self.original_content:
+        # Panes sharing another pane's model only render its pages
+        if self.source_document is None or not self.owns_pagination:
             return
         
         # Use direct viewport-based pagination for consistent page filling
@@ -513,73 +2508,8 @@ class LessTextEdit(QTextEdit):
     
     def calculate_viewport_pagination(self):
         """Calculate pagination using visual lines for perfect viewport fitting"""
-        if not self.original_content:
-            return
-        
-        lines = self.original_content.split('\n')
-        
-        if not self.word_wrap_enabled:
-            # No-wrap mode: simple line-based pagination
-            viewport_height = self.viewport().height()
-            font_metrics = self.fontMetrics()
-            line_height = font_metrics.lineSpacing()
-            self.lines_per_page = max(1, (viewport_height - 40) // line_height)
-            total_lines = len(lines)
-            self.total_pages = max(1, (total_lines + self.lines_per_page - 1) // self.lines_per_page)
-            return
-        
-        # For word wrap mode, use visual line-based pagination
-        self.calculate_visual_line_pagination(lines)
-    
-    def calculate_visual_line_pagination(self, lines):
-        """Calculate pagination using visual lines with proper line breaking"""
-        # Get viewport metrics
-        viewport_height = self.viewport().height() - 40  # Leave margin
-        font_metrics = self.fontMetrics()
-        line_height = font_metrics.lineSpacing()
-        char_width = font_metrics.averageCharWidth()
-        
-        # Calculate how many visual lines fit per page
-        visual_lines_per_page = max(1, viewport_height // line_height)
-        
-        # Calculate viewport width in characters
-        viewport_width = self.viewport().width() - 40  # Account for margins
-        chars_per_line = max(1, viewport_width // char_width)
-        
-        # Convert all text lines to visual lines using textwrap
-        all_visual_lines = []
-        visual_to_text_line_map = []  # Track which text line each visual line came from
-        
-        for text_line_num, text_line in enumerate(lines):
-            if not text_line.strip():  # Empty line
-                all_visual_lines.append('')
-                visual_to_text_line_map.append(text_line_num + 1)  # 1-based line numbers
-            else:
-                # Use textwrap to break long lines properly
-                wrapped_lines = textwrap.wrap(
-                    text_line, 
-                    width=chars_per_line,
-                    break_long_words=True,
-                    break_on_hyphens=True
-                )
-                if wrapped_lines:
-                    all_visual_lines.extend(wrapped_lines)
-                    # Map each visual line to its original text line
-                    for _ in wrapped_lines:
-                        visual_to_text_line_map.append(text_line_num + 1)
-                else:
-                    all_visual_lines.append('')  # Empty wrapped line
-                    visual_to_text_line_map.append(text_line_num + 1)
-        
-        # Create page breaks based on visual lines
-        total_visual_lines = len(all_visual_lines)
-        self.total_pages = max(1, (total_visual_lines + visual_lines_per_page - 1) // visual_lines_per_page)
-        
-        # Store visual lines and pagination info
-        self.visual_lines = all_visual_lines
-        self.visual_lines_per_page = visual_lines_per_page
-        self.visual_to_text_line_map = visual_to_text_line_map
-        self.use_visual_line_pagination = True
+        self.pagination.paginate(self.viewport().size(), self.fontMetrics(),
+                                 self.word_wrap_enabled, self.current_page)
     
     def calculate_dynamic_page_breaks(self, lines):
         """Calculate page breaks by measuring actual content height in viewport"""
@@ -641,7 +2571,7 @@ class LessTextEdit(QTextEdit):
     
     def calculate_fallback_pagination(self):
         """Fallback pagination calculation when HTML method fails"""
-        if not self.original_content:
+        if self.source_document is None:
             return
             
         # Get viewport height and font metrics
@@ -655,11 +2585,10 @@ class LessTextEdit(QTextEdit):
         # Calculate total pages based on word wrap mode
         if self.word_wrap_enabled:
             # For word wrap, use aggressive reduction for long-line documents
-            lines = self.original_content.split('\n')
-            total_lines = len(lines)
+            total_lines = self.source_document.line_count
             
-            # Analyze line lengths for wrapping estimation
-            long_line_count = sum(1 for line in lines if len(line) > 100)
+            # Analyze line lengths for wrapping estimation (from the line index)
+            long_line_count = sum(1 for length in self.source_document.iter_line_lengths() if length > 100)
             long_line_ratio = long_line_count / max(total_lines, 1) if total_lines > 0 else 0
             
             if long_line_ratio > 0.4:  # More than 40% of lines are very long
@@ -676,20 +2605,19 @@ class LessTextEdit(QTextEdit):
             self.effective_lines_per_page = effective_lines_per_page
         else:
             # Simple line-based pagination for no-wrap mode
-            total_lines = len(self.original_content.split('\n'))
+            total_lines = self.source_document.line_count
             self.total_pages = max(1, (total_lines + self.lines_per_page - 1) // self.lines_per_page)
     
     def calculate_wrapped_pagination(self):
         """Calculate pagination when word wrap is enabled - content-density-based approach"""
-        lines = self.original_content.split('\n')
-        total_lines = len(lines)
+        line_lengths = self.source_document.iter_line_lengths()
         
         # Use content-density-based pagination for more consistent page sizes
         # Target: ~800-1200 characters per page for comfortable reading
         target_chars_per_page = 1000
         
         # Calculate page breaks based on content density
-        self.page_breaks = self.calculate_content_based_breaks(lines, target_chars_per_page)
+        self.page_breaks = self.calculate_content_based_breaks(line_lengths, target_chars_per_page)
         self.total_pages = len(self.page_breaks)
         
         # Store for content setting
@@ -698,8 +2626,9 @@ class LessTextEdit(QTextEdit):
     def convert_text_to_html(self, text_content):
         """Convert plain text to HTML for better pagination control"""
         # Detect if this might be markdown
+        markdown = optional_module('markdown')
         is_markdown = (
-            MARKDOWN_AVAILABLE and 
+            markdown is not None and 
             (
                 '# ' in text_content or 
                 '## ' in text_content or 
@@ -746,11 +2675,11 @@ class LessTextEdit(QTextEdit):
     
     def calculate_html_pagination(self):
         """Calculate pagination using QTextDocument with HTML content"""
-        if not self.original_content:
+        if self.source_document is None:
             return
         
         # Convert text to HTML
-        html_content = self.convert_text_to_html(self.original_content)
+        html_content = self.convert_text_to_html('\n'.join(self.source_document.get_lines()))
         
         # Create a temporary QTextDocument for pagination calculation
         temp_doc = QTextDocument()
@@ -770,14 +2699,15 @@ class LessTextEdit(QTextEdit):
         
         return self.total_pages
     
-    def calculate_content_based_breaks(self, lines, target_chars_per_page):
+    def calculate_content_based_breaks(self, line_lengths, target_chars_per_page):
         """Calculate page breaks based on content density rather than line count"""
         page_breaks = []
         current_page_chars = 0
         current_page_start = 0
+        line_count = 0
         
-        for i, line in enumerate(lines):
-            line_length = len(line)
+        for i, line_length in enumerate(line_lengths):
+            line_count += 1
             
             # Check if adding this line would exceed target
             if current_page_chars + line_length > target_chars_per_page and current_page_chars > 0:
@@ -789,34 +2719,79 @@ class LessTextEdit(QTextEdit):
                 current_page_chars += line_length + 1  # +1 for newline
         
         # Add final page if there's remaining content
-        if current_page_start < len(lines):
-            page_breaks.append((current_page_start, len(lines) - 1))
+        if current_page_start < line_count:
+            page_breaks.append((current_page_start, line_count - 1))
         
-        return page_breaks if page_breaks else [(0, len(lines) - 1)]
+        return page_breaks if page_breaks else [(0, line_count - 1)]
     
+    @profiled('set_page_content')
     def set_page_content(self, page_number):
         """Set content for a specific page"""
-        if not self.original_content or page_number < 1:
+        if self.source_document is None or page_number < 1:
             return
             
         self.current_page = page_number
         
+        self.setPlainText(self.render_page(page_number))
+        # Ensure cursor and scroll position are at the top of the page
+        cursor = self.textCursor()
+        cursor.movePosition(QTextCursor.Start)
+        self.setTextCursor(cursor)
+        self.ensureCursorVisible()
+    
+    def page_cache_key(self, page_number):
+        """Key identifying the rendered text of a page in the render cache"""
+        # Page geometry follows from font, zoom and viewport size. The page
+        # number and layout key come first and third, see discard_from_line()
+        line_number_width = self.line_number_width() if self.show_line_numbers else 0
+        return (page_number, self.word_wrap_enabled, self.pagination.layout_key, line_number_width)
+    
+    def line_number_width(self):
+        """Width of the line numbers, which always count lines of the source file"""
+        return len(str(self.source_document.source.line_count))
+    
+    def render_page(self, page_number):
+        """Return the text of a page, from the render cache when possible"""
+        cache = self.pagination.page_cache
+        key = self.page_cache_key(page_number)
+        page_content = cache.get(key)
+        if page_content is not None:
+            return page_content
+        
+        # Reading a mapped file past its new end would raise SIGBUS
+        if self.source_document.source.shrunk():
+            self.source_truncated.emit()
+            return ""
+        
         if self.word_wrap_enabled:
-            self.set_wrapped_page_content(page_number)
+            page_content, complete = self.render_wrapped_page(page_number)
         else:
-            self.set_nowrap_page_content(page_number)
-    
-    def set_nowrap_page_content(self, page_number):
-        """Set page content for no-wrap mode"""
-        lines = self.original_content.split('\n')
+            page_content, complete = self.render_nowrap_page(page_number)
         
+        # A page that is not full may still grow while the file is loading
+        if complete:
+            cache.put(key, page_content)
+        return page_content
+    
+    def prefetch_page(self, page_number):
+        """Render a page into the cache without displaying it"""
+        if self.source_document is not None and 1 <= page_number <= self.total_pages:
+            self.render_page(page_number)
+    
+    def render_nowrap_page(self, page_number):
+        """Return (page text, page is final) for no-wrap mode"""
         # Calculate start and end lines for this page
         start_line = (page_number - 1) * self.lines_per_page
-        end_line = min(start_line + self.lines_per_page, len(lines))
-        
-        # Get page content
-        if start_line < len(lines):
-            page_lines = lines[start_line:end_line]
+        # A filtered document finds its lines as they are needed
+        self.source_document.ensure_lines(start_line + self.lines_per_page)
+        self.pagination.update_page_count()
+        total_lines = self.source_document.line_count
+        end_line = min(start_line + self.lines_per_page, total_lines)
+        complete = self.source_document.index_complete or end_line - start_line == self.lines_per_page
+        
+        # Get page content, decoding only the lines on this page
+        if start_line < total_lines:
+            page_lines = self.source_document.get_lines(start_line, end_line, self.NOWRAP_LINE_CHARS)
             page_content = '\n'.join(page_lines)
         else:
             page_content = ""  # Beyond end of document
@@ -824,90 +2799,67 @@ class LessTextEdit(QTextEdit):
         # Apply line numbers if enabled
         if self.show_line_numbers and page_content:
             numbered_lines = []
-            total_lines = len(lines)
-            width = len(str(total_lines))
+            width = self.line_number_width()
+            line_number = self.source_document.line_number
             
-            for i, line in enumerate(page_lines, start_line + 1):
-                line_num = str(i).rjust(width)
+            for i, line in enumerate(page_lines, start_line):
+                line_num = str(line_number(i)).rjust(width)
                 numbered_lines.append(f"{line_num}: {line}")
             
             page_content = '\n'.join(numbered_lines)
         
-        self.setPlainText(page_content)
-        # Ensure cursor and scroll position are at the top of the page
-        cursor = self.textCursor()
-        cursor.movePosition(QTextCursor.Start)
-        self.setTextCursor(cursor)
-        self.ensureCursorVisible()
+        return page_content, complete
     
-    def set_wrapped_page_content(self, page_number):
-        """Set page content for word wrap mode using visual line pagination"""
+    def render_wrapped_page(self, page_number):
+        """Return (page text, page is final) for word wrap mode using visual line pagination"""
         # Check if we have visual line pagination (perfect page filling)
-        if hasattr(self, 'use_visual_line_pagination') and hasattr(self, 'visual_lines'):
+        if self.wrap_paginator is not None:
             # Use the visual lines that perfectly fill pages
-            visual_lines_per_page = getattr(self, 'visual_lines_per_page', 25)
-            
-            start_visual_line = (page_number - 1) * visual_lines_per_page
-            end_visual_line = min(start_visual_line + visual_lines_per_page, len(self.visual_lines))
+            page_rows = self.wrap_paginator.get_page(page_number)
+            # Wrapping this page may have refined the page count estimate
+            self.pagination.update_wrapped_page_count()
+            complete = (self.source_document.index_complete or
+                        len(page_rows) == self.wrap_paginator.visual_lines_per_page)
             
-            if start_visual_line < len(self.visual_lines):
-                page_visual_lines = self.visual_lines[start_visual_line:end_visual_line]
-                page_content = '\n'.join(page_visual_lines)
-                
-                # Apply line numbers if enabled
-                if self.show_line_numbers and hasattr(self, 'visual_to_text_line_map'):
-                    numbered_lines = []
-                    total_text_lines = len(self.original_content.split('\n'))
-                    width = len(str(total_text_lines))
-                    
-                    for i, visual_line in enumerate(page_visual_lines):
-                        visual_line_index = start_visual_line + i
-                        if visual_line_index < len(self.visual_to_text_line_map):
-                            text_line_num = self.visual_to_text_line_map[visual_line_index]
-                            line_num = str(text_line_num).rjust(width)
-                            numbered_lines.append(f"{line_num}: {visual_line}")
-                        else:
-                            # Fallback if mapping is incomplete
-                            numbered_lines.append(f"{'?'.rjust(width)}: {visual_line}")
-                    
-                    page_content = '\n'.join(numbered_lines)
-                
-                self.setPlainText(page_content)
+            # Apply line numbers if enabled
+            if self.show_line_numbers:
+                width = self.line_number_width()
+                line_number = self.source_document.line_number
+                page_content = '\n'.join(
+                    f"{str(line_number(text_line_num - 1)).rjust(width)}: {visual_line}"
+                    for text_line_num, visual_line in page_rows
+                )
             else:
-                self.setPlainText("")
-        else:
-            # Fallback to line-based pagination
-            lines = self.original_content.split('\n')
-            effective_lines_per_page = getattr(self, 'effective_lines_per_page', max(1, self.lines_per_page // 3))
+                page_content = '\n'.join(visual_line for _, visual_line in page_rows)
+            
+            return page_content, complete
+        
+        # Fallback to line-based pagination
+        total_lines = self.source_document.line_count
+        effective_lines_per_page = getattr(self, 'effective_lines_per_page', max(1, self.lines_per_page // 3))
+        
+        start_line = (page_number - 1) * effective_lines_per_page
+        end_line = min(start_line + effective_lines_per_page, total_lines)
+        
+        if start_line >= total_lines:
+            return "", False
+        
+        page_lines = self.source_document.get_lines(start_line, end_line)
+        page_content = '\n'.join(page_lines)
+        
+        # Apply line numbers if enabled
+        if self.show_line_numbers:
+            numbered_lines = []
+            width = len(str(total_lines))
             
-            start_line = (page_number - 1) * effective_lines_per_page
-            end_line = min(start_line + effective_lines_per_page, len(lines))
+            for i, line in enumerate(page_lines, start_line + 1):
+                line_num = str(i).rjust(width)
+                numbered_lines.append(f"{line_num}: {line}")
             
-            if start_line < len(lines):
-                page_lines = lines[start_line:end_line]
-                page_content = '\n'.join(page_lines)
-                
-                # Apply line numbers if enabled
-                if self.show_line_numbers:
-                    numbered_lines = []
-                    total_lines = len(lines)
-                    width = len(str(total_lines))
-                    
-                    for i, line in enumerate(page_lines, start_line + 1):
-                        line_num = str(i).rjust(width)
-                        numbered_lines.append(f"{line_num}: {line}")
-                    
-                    page_content = '\n'.join(numbered_lines)
-                
-                self.setPlainText(page_content)
-            else:
-                self.setPlainText("")
+            page_content = '\n'.join(numbered_lines)
         
-        # Ensure cursor and scroll position are at the top of the page
-        cursor = self.textCursor()
-        cursor.movePosition(QTextCursor.Start)
-        self.setTextCursor(cursor)
-        self.ensureCursorVisible()
+        # The fallback layout is not tracked by layout_key; don't cache it
+        return page_content, False
     
     def set_html_page_content(self, page_number):
         """Set page content using HTML-based pagination for perfect viewport fitting"""
@@ -959,7 +2911,7 @@ class LessTextEdit(QTextEdit):
         if self.show_line_numbers and page_text:
             lines = page_text.split('\n')
             numbered_lines = []
-            total_lines = len(self.original_content.split('\n'))
+            total_lines = self.source_document.line_count
             width = len(str(total_lines))
             
             # Estimate starting line number based on position
@@ -980,22 +2932,21 @@ class LessTextEdit(QTextEdit):
     def set_wrapped_page_content_fallback(self, page_number):
         """Fallback method for wrapped content pagination"""
         # Use smaller chunks for better visual line approximation
-        lines = self.original_content.split('\n')
+        total_lines = self.source_document.line_count
         
         # Use the effective_lines_per_page calculated in calculate_wrapped_pagination
         effective_lines_per_page = getattr(self, 'effective_lines_per_page', max(1, self.lines_per_page // 3))
         
         start_line = (page_number - 1) * effective_lines_per_page
-        end_line = min(start_line + effective_lines_per_page, len(lines))
+        end_line = min(start_line + effective_lines_per_page, total_lines)
         
-        if start_line < len(lines):
-            page_lines = lines[start_line:end_line]
+        if start_line < total_lines:
+            page_lines = self.source_document.get_lines(start_line, end_line)
             page_content = '\n'.join(page_lines)
             
             # Apply line numbers if enabled
             if self.show_line_numbers:
                 numbered_lines = []
-                total_lines = len(lines)
                 width = len(str(total_lines))
                 
                 for i, line in enumerate(page_lines, start_line + 1):
@@ -1014,13 +2965,78 @@ class LessTextEdit(QTextEdit):
         self.setTextCursor(cursor)
         self.ensureCursorVisible()
     
+    def first_line_of_page(self, page_number):
+        """Return the 0-based source line at the top of a page"""
+        return self.pagination.first_line_of_page(page_number)
+    
+    def page_for_line(self, line_index):
+        """Return the page on which a 0-based source line starts"""
+        return self.pagination.page_for_line(line_index)
+    
+    def text_cursor_at(self, row, column, length):
+        """Return a cursor selecting length characters at a row and column of the page text"""
+        if self.show_line_numbers:
+            # Skip the "NNN: " prefix added by the page renderer
+            column += self.line_number_width() + 2
+        block = self.document().findBlockByNumber(row)
+        if not block.isValid():
+            return None
+        line_end = block.position() + block.length() - 1
+        start = min(block.position() + column, line_end)
+        
+        cursor = QTextCursor(block)
+        cursor.setPosition(start)
+        cursor.setPosition(min(start + length, line_end), QTextCursor.KeepAnchor)
+        return cursor
+    
+    def select_text(self, row, column, length):
+        """Select length characters at a row and column of the page text"""
+        cursor = self.text_cursor_at(row, column, length)
+        if cursor is not None:
+            self.setTextCursor(cursor)
+    
+    def set_theme_colors(self, theme):
+        """Colour the page text, selection and search highlights with a theme
+        
+        The colours are set through the palette rather than a stylesheet, so
+        changing them only repaints this pane.
+        """
+        palette = self.palette()
+        palette.setColor(QPalette.Base, QColor(theme['background']))
+        palette.setColor(QPalette.Text, QColor(theme['text']))
+        palette.setColor(QPalette.Highlight, QColor(theme['selection_bg']))
+        palette.setColor(QPalette.HighlightedText, QColor(theme['selection_text']))
+        self.setPalette(palette)
+        # Once the window stylesheet has polished the viewport it keeps its
+        # own palette instead of inheriting the pane's
+        self.viewport().setPalette(palette)
+        self.set_highlight_colors(theme['highlight_bg'], theme['highlight_text'])
+    
+    def set_highlight_colors(self, background, text):
+        """Set the theme colours used to highlight search matches"""
+        self.match_format.setBackground(QColor(background))
+        self.match_format.setForeground(QColor(text))
+    
+    def highlight_matches(self, positions):
+        """Highlight search matches given as (row, column, length) on the page shown"""
+        selections = []
+        for row, column, length in positions:
+            cursor = self.text_cursor_at(row, column, length)
+            if cursor is None:
+                continue
+            selection = QTextEdit.ExtraSelection()
+            selection.cursor = cursor
+            selection.format = self.match_format
+            selections.append(selection)
+        self.setExtraSelections(selections)
+    
     def resizeEvent(self, event):
-        """Recalculate pagination when window is resized"""
+        """Request repagination when the window is resized"""
         super().resizeEvent(event)
-        if hasattr(self, 'original_content') and self.original_content:
-            self.calculate_pagination()
-            # Re-display current page with new pagination
-            self.set_page_content(self.current_page)
+        if self.source_document is not None:
+            # Repaginating on every event would redo the work dozens of
+            # times per second during a drag; the owner coalesces these
+            self.viewport_resized.emit()
     
     def toggle_line_numbers(self, show):
         """Toggle line number display"""
@@ -1031,14 +3047,310 @@ class LessTextEdit(QTextEdit):
     def toggle_word_wrap(self, enable):
         """Toggle word wrap mode"""
         self.word_wrap_enabled = enable
-        self.setLineWrapMode(QTextEdit.WidgetWidth if enable else QTextEdit.NoWrap)
+        self.setLineWrapMode(QPlainTextEdit.WidgetWidth if enable else QPlainTextEdit.NoWrap)
         
         # Recalculate pagination and refresh display
-        if hasattr(self, 'original_content') and self.original_content:
+        if self.source_document is not None:
             self.calculate_pagination()
             self.set_page_content(self.current_page)
 
 
+def write_file_atomic(path, write, mode='w'):
+    """Write a file with write(f) so that readers see either the old or the new file
+    
+    The contents are written to a temporary file next to path, flushed to
+    disk and renamed over path, so a crash mid-write cannot leave a
+    truncated file.
+    """
+    path = Path(path)
+    path.parent.mkdir(exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, mode) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path, data):
+    """Write data to a JSON file, see write_file_atomic()"""
+    write_file_atomic(path, lambda f: json.dump(data, f, indent=2))
+
+
+class ConfigWriter(QThread):
+    """Write the configuration off the GUI thread, see write_json_atomic()"""
+
+    failed = pyqtSignal(str)
+
+    def __init__(self, config_file, config_data, parent=None):
+        super().__init__(parent)
+        self.config_file = config_file
+        self.config_data = config_data
+
+    def run(self):
+        try:
+            write_json_atomic(self.config_file, self.config_data)
+        except (OSError, TypeError, ValueError) as e:
+            self.failed.emit(str(e))
+
+
+class ReadingStateCache:
+    """Reading positions, line indexes and wrap layouts of files, kept across sessions
+
+    Every file gets a small JSON entry in cache_dir, named after a hash of
+    its path, with the byte offset at the top of the last page read and
+    the page number for the layout it was read in. For plain files of
+    INDEX_MIN_BYTES and more, the line index and the part of the wrap
+    layout computed so far are stored next to it as raw arrays, so that
+    reopening the file skips indexing and rewrapping. An entry only
+    applies while the file keeps the size and modification time it was
+    saved with. The cache keeps at most MAX_ENTRIES files and MAX_BYTES.
+    """
+
+    INDEX_MIN_BYTES = 32 * 1024 * 1024
+    MAX_ENTRIES = 50
+    MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+
+    def entry_path(self, file_path, suffix):
+        """Return the cache file with a suffix ('.json', '.index' or '.wrap') for a file"""
+        import hashlib
+        name = hashlib.sha1(os.fsencode(os.path.abspath(file_path))).hexdigest()
+        return self.cache_dir / f"{name}{suffix}"
+
+    @staticmethod
+    def file_key(file_path):
+        """Return the (size, mtime_ns) of a file, which its entry has to match"""
+        stat = os.stat(file_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def load(self, file_path, key):
+        """Return the entry saved for a file if it still matches key, otherwise None"""
+        try:
+            with open(self.entry_path(file_path, '.json')) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (not isinstance(entry, dict) or entry.get('path') != os.path.abspath(file_path) or
+                [entry.get('size'), entry.get('mtime_ns')] != list(key) or
+                entry.get('byteorder') != sys.byteorder):
+            return None
+        return entry
+
+    def load_index(self, entry, document):
+        """Give a document that has not been indexed yet its saved line index; True on success"""
+        index = entry.get('index')
+        if not index or type(document) is not MappedDocument or index['encoding'] != document.encoding:
+            return False
+        line_starts = array('Q')
+        try:
+            with open(self.entry_path(document.file_path, '.index'), 'rb') as f:
+                line_starts.fromfile(f, index['lines'])
+        except (OSError, EOFError):
+            return False
+        document.line_starts = line_starts
+        document.indexed_bytes = document.size
+        document.index_complete = True
+        return True
+
+    def load_wrap(self, entry, document):
+        """Return a WrapPaginator with the saved wrap layout of a fully indexed document, or None"""
+        wrap = entry.get('wrap')
+        if not wrap or not document.index_complete or wrap['wrapped_line_count'] > document.line_count:
+            return None
+        paginator = WrapPaginator(document, wrap['chars_per_line'], wrap['visual_lines_per_page'])
+        chunk_line_counts = array('Q')
+        chunk_visual_starts = array('Q')
+        try:
+            with open(self.entry_path(document.file_path, '.wrap'), 'rb') as f:
+                chunk_line_counts.fromfile(f, wrap['chunks'])
+                chunk_visual_starts.fromfile(f, wrap['chunks'] + 1)
+                paginator.visual_to_text_line_map.fromfile(f, wrap['visual_lines'])
+                paginator.visual_line_spans.fromfile(f, 2 * wrap['visual_lines'])
+        except (OSError, EOFError):
+            return None
+        paginator.chunk_line_counts = chunk_line_counts.tolist()
+        paginator.chunk_visual_starts = chunk_visual_starts.tolist()
+        paginator.wrapped_line_count = wrap['wrapped_line_count']
+        return paginator
+
+    def save(self, file_path, key, offset, page=None, layout=None, document=None, paginator=None):
+        """Save the reading position of a file, with its line index and wrap layout if given
+
+        A line index already saved for this version of the file is not
+        written again.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'path': os.path.abspath(file_path),
+            'size': key[0],
+            'mtime_ns': key[1],
+            'byteorder': sys.byteorder,
+            'offset': offset,
+            'page': page,
+            'layout': layout,
+            'index': None,
+            'wrap': None
+        }
+
+        # Arrays too big for the whole cache are not saved at all
+        budget = self.MAX_BYTES
+        if document is not None:
+            budget -= len(document.line_starts) * document.line_starts.itemsize
+            if budget < 0:
+                document = None
+        if paginator is not None:
+            visual_lines = len(paginator.visual_to_text_line_map)
+            budget -= 16 * len(paginator.chunk_line_counts) + 12 * visual_lines
+            if budget < 0:
+                paginator = None
+
+        if document is not None:
+            old_entry = self.load(file_path, key)
+            index = {'lines': len(document.line_starts), 'encoding': document.encoding}
+            if old_entry is None or old_entry.get('index') != index:
+                write_file_atomic(self.entry_path(file_path, '.index'), document.line_starts.tofile, 'wb')
+            entry['index'] = index
+
+        if paginator is not None:
+            def write_wrap(f):
+                array('Q', paginator.chunk_line_counts).tofile(f)
+                array('Q', paginator.chunk_visual_starts).tofile(f)
+                paginator.visual_to_text_line_map.tofile(f)
+                paginator.visual_line_spans.tofile(f)
+
+            write_file_atomic(self.entry_path(file_path, '.wrap'), write_wrap, 'wb')
+            entry['wrap'] = {
+                'chars_per_line': paginator.chars_per_line,
+                'visual_lines_per_page': paginator.visual_lines_per_page,
+                'wrapped_line_count': paginator.wrapped_line_count,
+                'chunks': len(paginator.chunk_line_counts),
+                'visual_lines': len(paginator.visual_to_text_line_map)
+            }
+
+        # Arrays left from an older version of the file are of no use
+        for suffix, key_name in (('.index', 'index'), ('.wrap', 'wrap')):
+            if entry[key_name] is None:
+                self.remove(self.entry_path(file_path, suffix))
+
+        write_json_atomic(self.entry_path(file_path, '.json'), entry)
+        self.prune()
+
+    def prune(self):
+        """Remove the entries of the least recently saved files beyond MAX_ENTRIES or MAX_BYTES
+
+        The newest entry, the one just saved, is always kept.
+        """
+        entries = sorted(self.cache_dir.glob('*.json'), key=lambda path: path.stat().st_mtime, reverse=True)
+        total = 0
+        for count, path in enumerate(entries):
+            paths = [path.with_suffix(suffix) for suffix in ('.json', '.index', '.wrap')]
+            size = sum(self.file_size(entry_path) for entry_path in paths)
+            if count and (count >= self.MAX_ENTRIES or total + size > self.MAX_BYTES):
+                for entry_path in paths:
+                    self.remove(entry_path)
+            else:
+                total += size
+
+    @staticmethod
+    def file_size(path):
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def remove(path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ReadingStateWriter(QThread):
+    """Save a reading state off the GUI thread, see ReadingStateCache.save()"""
+
+    failed = pyqtSignal(str)
+
+    def __init__(self, cache, state, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.state = state
+
+    def run(self):
+        try:
+            self.cache.save(**self.state)
+        except (OSError, ValueError) as e:
+            self.failed.emit(str(e))
+
+
+class RecentFileChecker(QThread):
+    """Check which recent files still exist without blocking the GUI thread
+
+    Every path is checked in its own daemon thread, because a stat on a
+    stale network mount can hang for minutes and cannot be interrupted.
+    Paths that give no answer within TIMEOUT seconds are reported as
+    'unavailable'; the others as 'available' or 'missing', as the answers
+    come in. A path whose stat from an earlier check has not returned yet
+    gets no second thread; this check waits for the same answer.
+    """
+
+    checked = pyqtSignal(str, str)
+
+    TIMEOUT = 2.0
+
+    # Path -> answer queues of the checkers waiting for its stat, shared by all checkers
+    waiting = {}
+    waiting_lock = threading.Lock()
+
+    def __init__(self, paths, parent=None):
+        super().__init__(parent)
+        self.paths = paths
+
+    @classmethod
+    def check(cls, path):
+        """Stat a path in a daemon thread and answer every checker waiting for it"""
+        exists = os.path.exists(path)
+        with cls.waiting_lock:
+            waiting = cls.waiting.pop(path)
+        for answers in waiting:
+            answers.put((path, exists))
+
+    def run(self):
+        answers = queue.SimpleQueue()
+        for path in self.paths:
+            with self.waiting_lock:
+                waiting = self.waiting.setdefault(path, [])
+                waiting.append(answers)
+                if len(waiting) > 1:
+                    continue  # Still being checked
+            threading.Thread(target=self.check, args=(path,), name='RecentFileCheck', daemon=True).start()
+
+        pending = set(self.paths)
+        deadline = time.monotonic() + self.TIMEOUT
+        while pending and not self.isInterruptionRequested():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                for path in pending:
+                    self.checked.emit(path, 'unavailable')
+                return
+            try:
+                path, exists = answers.get(timeout=min(remaining, 0.1))
+            except queue.Empty:
+                continue
+            pending.discard(path)
+            self.checked.emit(path, 'available' if exists else 'missing')
+
+
 class GuiLess(QMainWindow):
     """Main GUI Less application window"""
     
@@ -1047,6 +3359,57 @@ class GuiLess(QMainWindow):
         self.current_file = None
         self.two_page_mode = True  # Default to two page mode
         self.current_left_page = 1
+        self.file_loader = None  # Background FileLoader for the file being opened
+        self.first_page_pending = True  # Until the first document is on screen
+        
+        # Config changes made in quick succession are saved in one write
+        self.config_save_timer = QTimer(self)
+        self.config_save_timer.setSingleShot(True)
+        self.config_save_timer.setInterval(300)
+        self.config_save_timer.timeout.connect(self.write_config)
+        self.config_writer = None  # ConfigWriter of the last write
+        
+        # Resize events from both panes are coalesced into one repagination
+        self.repagination_timer = QTimer(self)
+        self.repagination_timer.setSingleShot(True)
+        self.repagination_timer.setInterval(150)
+        self.repagination_timer.timeout.connect(self.refresh_pagination)
+        
+        # Neighbouring pages are rendered into the page cache when idle
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(0)
+        self.prefetch_timer.timeout.connect(self.prefetch_pages)
+        
+        # Memory cap for the rendered page cache
+        self.page_cache_mb = 16
+        
+        # Follow mode (less +F): data appended to the file is shown as it arrives
+        self.follow_mode = False
+        self.follow_pinned = False  # Stay on the last page until the user pages back
+        self.follow_indexer = None  # FileLoader indexing the appended data
+        self.follow_wrap_lines = 32768  # Lines wrapped per pass while catching up
+        
+        # Whole-document search; n/N step through its sorted match offsets
+        self.search_engine = None
+        self.search_term = ''
+        self.search_regex = False
+        self.search_ignore_case = False
+        self.search_whole_word = False
+        self.search_offset = -1  # Byte offset of the current match
+        self.search_pending = False  # Waiting for the scan to reach the next match
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(self.schedule_follow_check)
+        # Change notifications are coalesced; a burst of writes is handled
+        # in one pass instead of one pass per write
+        self.follow_check_timer = QTimer(self)
+        self.follow_check_timer.setSingleShot(True)
+        self.follow_check_timer.setInterval(50)
+        self.follow_check_timer.timeout.connect(self.check_followed_file)
+        # Polling catches changes the watcher misses, e.g. on network filesystems
+        self.follow_poll_timer = QTimer(self)
+        self.follow_poll_timer.setInterval(500)
+        self.follow_poll_timer.timeout.connect(self.check_followed_file)
         
         # Recent files management
         self.max_recent_files = 10
@@ -1054,6 +3417,17 @@ class GuiLess(QMainWindow):
         self.last_directory = str(Path.home())  # Default to home directory
         self.config_dir = Path.home() / '.guiless'
         self.config_file = self.config_dir / 'config.json'
+        self.recent_file_status = {}  # path -> 'available', 'unavailable' (see RecentFileChecker)
+        self.recent_file_checkers = []
+        self.open_when_checked = None  # (recent file, quiet) to open once it is known to exist
+        
+        # Reading positions and line indexes of files, see ReadingStateCache
+        self.reading_state_cache = ReadingStateCache(self.config_dir / 'files')
+        self.reading_state_writer = None
+        self.queued_reading_states = OrderedDict()  # file path -> state waiting for the writer
+        self.closing = False  # Closed, and waiting for the reading states to be written
+        self.current_file_key = None  # (size, mtime_ns) of the current file when opened
+        self.pending_position = None  # Saved state to restore once its offset is indexed
         
         # Theme management
         self.theme_manager = ThemeManager()
@@ -1070,6 +3444,9 @@ class GuiLess(QMainWindow):
         # Update navigation mode UI after loading config
         self.update_navigation_mode_ui()
         
+        # Find out in the background which recent files can still be opened
+        self.check_recent_files()
+        
         # Set fullscreen mode by default
         self.showMaximized()
     
@@ -1116,6 +3493,7 @@ class GuiLess(QMainWindow):
         
         # Recent files submenu
         self.recent_menu = file_menu.addMenu('Recent Files')
+        self.recent_menu.aboutToShow.connect(self.check_recent_files)
         self.update_recent_menu()
         
         file_menu.addSeparator()
@@ -1133,6 +3511,10 @@ class GuiLess(QMainWindow):
         find_action.triggered.connect(self.find_text)
         edit_menu.addAction(find_action)
         
+        filter_action = QAction('Filter Lines...', self)
+        filter_action.triggered.connect(self.filter_text)
+        edit_menu.addAction(filter_action)
+        
         edit_menu.addSeparator()
         
         # View options
@@ -1184,6 +3566,14 @@ class GuiLess(QMainWindow):
         
         view_menu.addSeparator()
         
+        self.follow_action = QAction('Follow Mode', self)
+        self.follow_action.setCheckable(True)
+        self.follow_action.setShortcut('Shift+F')
+        self.follow_action.triggered.connect(self.toggle_follow_mode)
+        view_menu.addAction(self.follow_action)
+        
+        view_menu.addSeparator()
+        
         # Two-page navigation mode submenu
         nav_mode_menu = view_menu.addMenu('Two-Page Navigation')
         
@@ -1207,6 +3597,18 @@ class GuiLess(QMainWindow):
         
         help_menu.addSeparator()
         
+        self.profile_action = QAction('Profiling', self)
+        self.profile_action.setCheckable(True)
+        self.profile_action.setStatusTip("Time the display hot paths and show them in the status bar")
+        self.profile_action.triggered.connect(self.set_profiling)
+        help_menu.addAction(self.profile_action)
+        
+        save_trace_action = QAction('Save Profile Trace...', self)
+        save_trace_action.triggered.connect(self.save_profile_trace)
+        help_menu.addAction(save_trace_action)
+        
+        help_menu.addSeparator()
+        
         about_action = QAction('About', self)
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
@@ -1229,6 +3631,12 @@ class GuiLess(QMainWindow):
         # Create text editors
         self.text_edit_1 = LessTextEdit()  # Left page
         self.text_edit_2 = LessTextEdit()  # Right page
+        self.text_edit_1.viewport_resized.connect(self.repagination_timer.start)
+        self.text_edit_2.viewport_resized.connect(self.repagination_timer.start)
+        # Queued: the page is being rendered when a pane finds the file truncated
+        self.text_edit_1.source_truncated.connect(self.on_source_truncated, Qt.QueuedConnection)
+        self.text_edit_2.source_truncated.connect(self.on_source_truncated, Qt.QueuedConnection)
+        self.text_edit_1.pagination.page_cache.max_bytes = self.page_cache_mb * 1024 * 1024
         
         # Add first text editor
         self.splitter.addWidget(self.text_edit_1)
@@ -1275,6 +3683,23 @@ class GuiLess(QMainWindow):
         self.setStatusBar(self.status_bar)
         
         # Add permanent widgets to status bar
+        self.cancel_load_btn = QPushButton("Cancel")
+        self.cancel_load_btn.setToolTip("Stop loading the current file (Esc)")
+        self.cancel_load_btn.clicked.connect(self.cancel_loading)
+        self.cancel_load_btn.hide()
+        self.status_bar.addPermanentWidget(self.cancel_load_btn)
+        
+        # Profiling readout: last/p95 run times of the hot paths and memory use
+        self.profile_label = QLabel("")
+        self.profile_label.hide()
+        self.status_bar.addPermanentWidget(self.profile_label)
+        self.profile_timer = QTimer(self)
+        self.profile_timer.setInterval(500)
+        self.profile_timer.timeout.connect(self.update_profile_readout)
+        
+        self.encoding_label = QLabel("")
+        self.status_bar.addPermanentWidget(self.encoding_label)
+        
         self.line_col_label = QLabel("Line: 1, Col: 1")
         self.status_bar.addPermanentWidget(self.line_col_label)
         
@@ -1287,11 +3712,14 @@ class GuiLess(QMainWindow):
         shortcuts = {
             'q': self.close,  # Quit
             'Ctrl+C': self.close,  # Alternative quit
+            '/': self.find_text,  # Search (regex or plain text)
             '?': self.find_text,  # Search
             'n': self.find_next,  # Find next
-            'N': self.find_previous,  # Find previous
+            'Shift+N': self.find_previous,  # Find previous
+            '&': self.filter_text,  # Show only matching lines
             'Space': self.next_pages,  # Next pages (like less)
             'b': self.previous_pages,  # Previous pages (like less)
+            'Escape': self.cancel_loading,  # Stop loading a large file
         }
         
         for key, func in shortcuts.items():
@@ -1314,43 +3742,73 @@ class GuiLess(QMainWindow):
                     self.last_directory = str(Path.home())  # Default
                     self.current_theme = 'Default'  # Default theme
                     self.sliding_window_mode = True  # Default navigation mode
+                    self.page_cache_mb = 16  # Default render cache size
                 else:
                     # New format - dict with all settings
                     self.recent_files = config_data.get('recent_files', [])
                     self.last_directory = config_data.get('last_directory', str(Path.home()))
                     self.current_theme = config_data.get('theme', 'Default')
                     self.sliding_window_mode = config_data.get('sliding_window_mode', True)
-                    
-                # Remove files that no longer exist
-                self.recent_files = [f for f in self.recent_files if os.path.exists(f)]
+                    self.page_cache_mb = config_data.get('page_cache_mb', 16)
+                
+                # Files that no longer exist are removed by check_recent_files(),
+                # off the startup path
             else:
                 self.recent_files = []
                 self.last_directory = str(Path.home())
                 self.current_theme = 'Default'
                 self.sliding_window_mode = True
+                self.page_cache_mb = 16
         except (json.JSONDecodeError, IOError):
             self.recent_files = []
             self.last_directory = str(Path.home())
             self.current_theme = 'Default'
             self.sliding_window_mode = True
+            self.page_cache_mb = 16
     
     def save_config(self):
-        """Save configuration including recent files, last directory, and theme"""
-        try:
-            # Create config directory if it doesn't exist
-            self.config_dir.mkdir(exist_ok=True)
-            
-            config_data = {
-                'recent_files': self.recent_files,
-                'last_directory': self.last_directory,
-                'theme': self.current_theme,
-                'sliding_window_mode': self.sliding_window_mode
-            }
-            
-            with open(self.config_file, 'w') as f:
-                json.dump(config_data, f, indent=2)
-        except IOError as e:
-            print(f"Warning: Could not save config: {e}")
+        """Save configuration including recent files, last directory, and theme
+        
+        The write is delayed briefly so that several changes are saved
+        together, and done by a ConfigWriter thread, since the home
+        directory may be on a slow network file system.
+        """
+        self.config_save_timer.start()
+    
+    def config_data(self):
+        """Return a snapshot of the settings that are saved in the config file"""
+        return {
+            'recent_files': list(self.recent_files),
+            'last_directory': self.last_directory,
+            'theme': self.current_theme,
+            'sliding_window_mode': self.sliding_window_mode,
+            'page_cache_mb': self.page_cache_mb
+        }
+    
+    def write_config(self):
+        """Write the configuration in the background"""
+        if self.config_writer is not None and self.config_writer.isRunning():
+            # Keep the writes in order: try again once this one is done
+            self.config_save_timer.start()
+            return
+        self.config_writer = ConfigWriter(self.config_file, self.config_data(), self)
+        self.config_writer.failed.connect(self.on_config_write_failed)
+        self.config_writer.start()
+    
+    def on_config_write_failed(self, message):
+        print(f"Warning: Could not save config: {message}")
+    
+    def flush_config(self):
+        """Finish any pending config write before the application exits"""
+        pending = self.config_save_timer.isActive()
+        self.config_save_timer.stop()
+        if self.config_writer is not None:
+            self.config_writer.wait()
+        if pending:
+            try:
+                write_json_atomic(self.config_file, self.config_data())
+            except OSError as e:
+                self.on_config_write_failed(str(e))
     
     def add_recent_file(self, file_path):
         """Add a file to the recent files list"""
@@ -1362,6 +3820,7 @@ class GuiLess(QMainWindow):
         
         # Add to beginning of list
         self.recent_files.insert(0, file_path)
+        self.recent_file_status[file_path] = 'available'
         
         # Limit list size
         self.recent_files = self.recent_files[:self.max_recent_files]
@@ -1381,19 +3840,24 @@ class GuiLess(QMainWindow):
             return
         
         for i, file_path in enumerate(self.recent_files):
-            if os.path.exists(file_path):
-                # Create action with filename and shortcut
-                filename = os.path.basename(file_path)
-                action = QAction(f"{i + 1}. {filename}", self)
-                action.setToolTip(file_path)
-                
-                # Add keyboard shortcut for first 9 files
-                if i < 9:
-                    action.setShortcut(f"Ctrl+{i + 1}")
-                
-                # Connect to open function
-                action.triggered.connect(lambda checked, path=file_path: self.open_recent_file(path))
-                self.recent_menu.addAction(action)
+            # Create action with filename and shortcut
+            filename = os.path.basename(file_path)
+            action = QAction(f"{i + 1}. {filename}", self)
+            action.setToolTip(file_path)
+            
+            # Files on a mount that did not answer are shown, but cannot be opened
+            if self.recent_file_status.get(file_path) == 'unavailable':
+                action.setText(f"{i + 1}. {filename} (unavailable)")
+                action.setToolTip(f"{file_path} could not be reached")
+                action.setEnabled(False)
+            
+            # Add keyboard shortcut for first 9 files
+            if i < 9:
+                action.setShortcut(f"Ctrl+{i + 1}")
+            
+            # Connect to open function
+            action.triggered.connect(lambda checked, path=file_path: self.open_recent_file(path))
+            self.recent_menu.addAction(action)
         
         # Add separator and clear option
         self.recent_menu.addSeparator()
@@ -1401,29 +3865,15 @@ class GuiLess(QMainWindow):
         clear_action.triggered.connect(self.clear_recent_files)
         self.recent_menu.addAction(clear_action)
     
-    def open_recent_file(self, file_path):
-        """Open a file from the recent files list"""
-        if os.path.exists(file_path):
-            if self.text_edit_1.load_file(file_path):
-                self.current_file = file_path
-                # Update last directory when opening recent file
-                self.last_directory = str(Path(file_path).parent)
-                self.setWindowTitle(f"GUI Less - {os.path.basename(file_path)}")
-                self.status_bar.showMessage(f"Loaded: {file_path}")
-                
-                # Update recent files (moves to top)
-                self.add_recent_file(file_path)
-                
-                # If in two-page mode, set up pagination
-                if self.two_page_mode:
-                    self.setup_two_page_display()
-        else:
-            # File no longer exists, remove from recent files
-            if file_path in self.recent_files:
-                self.recent_files.remove(file_path)
-                self.save_config()
-                self.update_recent_menu()
-            QMessageBox.warning(self, "File Not Found", f"The file '{file_path}' no longer exists.")
+    def open_recent_file(self, file_path, quiet=False):
+        """Open a file from the recent files list once a background check has found it
+        
+        The check is made by a RecentFileChecker, so a file on a hung mount
+        cannot freeze the window. Unless quiet, a file that is gone or out
+        of reach is reported.
+        """
+        self.open_when_checked = (file_path, quiet)
+        self.check_recent_files([file_path])
     
     def clear_recent_files(self):
         """Clear the recent files list"""
@@ -1436,34 +3886,477 @@ class GuiLess(QMainWindow):
         
         if reply == QMessageBox.Yes:
             self.recent_files = []
+            self.recent_file_status.clear()
             self.save_config()
             self.update_recent_menu()
     
     def load_most_recent_file(self):
-        """Load the most recent file if available"""
-        if self.recent_files and os.path.exists(self.recent_files[0]):
-            self.open_recent_file(self.recent_files[0])
+        """Load the most recent file if available
+        
+        The file is opened when a background check has found it, so startup
+        never waits on a slow mount.
+        """
+        if self.recent_files:
+            self.open_recent_file(self.recent_files[0], quiet=True)
+    
+    def check_recent_files(self, paths=None):
+        """Check in the background which recent files (all by default) exist, see RecentFileChecker"""
+        for checker in [checker for checker in self.recent_file_checkers if checker.isFinished()]:
+            self.recent_file_checkers.remove(checker)
+            checker.deleteLater()
+        paths = list(self.recent_files if paths is None else paths)
+        if not paths:
+            return
+        checker = RecentFileChecker(paths, self)
+        checker.checked.connect(self.on_recent_file_checked)
+        self.recent_file_checkers.append(checker)
+        checker.start()
+    
+    def on_recent_file_checked(self, file_path, status):
+        """Update the recent files menu with the result of a check"""
+        if self.sender() not in self.recent_file_checkers or file_path not in self.recent_files:
+            return
+        if status == 'missing':
+            # File no longer exists, remove from recent files
+            self.recent_files.remove(file_path)
+            self.recent_file_status.pop(file_path, None)
+            self.save_config()
+            self.update_recent_menu()
+        elif self.recent_file_status.get(file_path) != status:
+            self.recent_file_status[file_path] = status
+            self.update_recent_menu()
+        
+        if self.open_when_checked is not None and file_path == self.open_when_checked[0]:
+            _, quiet = self.open_when_checked
+            self.open_when_checked = None
+            if status == 'available':
+                self.load_document(file_path)
+            elif not quiet and status == 'missing':
+                QMessageBox.warning(self, "File Not Found", f"The file '{file_path}' no longer exists.")
+            elif not quiet:
+                QMessageBox.warning(self, "File Unavailable", f"The file '{file_path}' cannot be reached.")
+    
+    def stop_recent_file_checkers(self):
+        """Stop waiting for recent file checks; hung checks are left to their daemon threads"""
+        for checker in self.recent_file_checkers:
+            checker.requestInterruption()
+            checker.wait()
     
     def open_file(self):
         """Open a file dialog and load selected file"""
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Open Text File", self.last_directory, "Text Files (*.txt);;All Files (*)"
+            self, "Open Text File", self.last_directory, "Text Files (*.txt);;Compressed Files (*.gz *.bz2 *.xz *.zst);;All Files (*)"
         )
         
         if file_path:
-            if self.text_edit_1.load_file(file_path):
-                self.current_file = file_path
-                # Update last directory
-                self.last_directory = str(Path(file_path).parent)
-                self.setWindowTitle(f"GUI Less - {os.path.basename(file_path)}")
-                self.status_bar.showMessage(f"Loaded: {file_path}")
-                
-                # Add to recent files
-                self.add_recent_file(file_path)
-                
-                # If in two-page mode, set up pagination
-                if self.two_page_mode:
-                    self.setup_two_page_display()
+            self.load_document(file_path)
+    
+    def load_document(self, file_path):
+        """Open a file in the background; page 1 is shown as soon as it is indexed"""
+        self.load_started = time.perf_counter()
+        self.open_when_checked = None
+        self.stop_follow_indexer()
+        self.stop_search()
+        if self.follow_mode and file_path != self.current_file:
+            self.set_follow_mode(False)
+        if self.file_loader is not None:
+            self.cancel_loading(wait=True)
+            self.file_loader.deleteLater()
+        self.save_reading_state()
+        self.pending_position = None
+        
+        loader = FileLoader(file_path, self, state_cache=self.reading_state_cache)
+        loader.first_page_ready.connect(self.on_first_page_ready)
+        loader.progress.connect(self.on_load_progress)
+        loader.finished_loading.connect(self.on_load_finished)
+        loader.cancelled.connect(self.on_load_cancelled)
+        loader.failed.connect(self.on_load_failed)
+        loader.truncated.connect(self.on_source_truncated)
+        self.file_loader = loader
+        
+        self.status_bar.showMessage(f"Loading: {file_path}...")
+        loader.start()
+    
+    def cancel_loading(self, wait=False):
+        """Stop indexing the file being loaded, keeping what was read so far"""
+        loader = self.file_loader
+        if loader is None or not loader.isRunning():
+            return
+        loader.requestInterruption()
+        if wait:
+            # Replacing the loader: drop its pending signals and let it exit
+            loader.disconnect()
+            loader.wait()
+            self.cancel_load_btn.hide()
+    
+    def on_first_page_ready(self):
+        """Show the first page of the document while the rest is indexed"""
+        loader = self.sender()
+        if loader is not self.file_loader:
+            return
+        
+        file_path = loader.file_path
+        if profiler.enabled:
+            profiler.record('open_to_first_page', self.load_started, time.perf_counter())
+        if loader.wrap_paginator is not None:
+            # Kept by paginate() if the pages are still the same size
+            self.text_edit_1.pagination.wrap_paginator = loader.wrap_paginator
+        self.text_edit_1.set_source_document(loader.document)
+        self.current_file_key = loader.file_key
+        self.encoding_label.setText(loader.document.encoding.upper())
+        self.current_file = file_path
+        # Update last directory
+        self.last_directory = str(Path(file_path).parent)
+        self.setWindowTitle(f"GUI Less - {os.path.basename(file_path)}")
+        
+        # Add to recent files (moves to top)
+        self.add_recent_file(file_path)
+        
+        # Set up pagination for the current display mode
+        if self.two_page_mode:
+            self.setup_two_page_display()
+        else:
+            self.setup_single_page_display()
+        
+        if loader.document.index_complete:
+            self.status_bar.showMessage(f"Loaded: {file_path}")
+        else:
+            self.cancel_load_btn.show()
+            self.status_bar.showMessage(f"Loading: {file_path}... 0%")
+        
+        if self.follow_mode and self.follow_pinned:
+            # The followed file was reopened after being truncated
+            self.show_last_page()
+        else:
+            self.pending_position = self.unwritten_reading_state(file_path, loader.file_key) or loader.reading_state
+            self.restore_reading_position()
+        
+        if self.first_page_pending:
+            self.first_page_pending = False
+            if profiler.enabled:
+                profiler.record('time_to_first_page', STARTED_AT, time.perf_counter())
+    
+    def on_load_progress(self, percent):
+        """Report indexing progress and refresh the page count"""
+        if self.sender() is not self.file_loader:
+            return
+        self.status_bar.showMessage(f"Loading: {self.current_file}... {percent}%")
+        self.refresh_pagination()
+        self.restore_reading_position()
+    
+    def on_load_finished(self):
+        """Finalize pagination once the whole file is indexed"""
+        loader = self.sender()
+        if loader is not self.file_loader:
+            return
+        self.cancel_load_btn.hide()
+        # A file that fits in the first chunk is already fully paginated
+        if loader.document.indexed_bytes > FileLoader.FIRST_CHUNK_BYTES:
+            self.refresh_pagination()
+            self.status_bar.showMessage(f"Loaded: {self.current_file}")
+        self.restore_reading_position()
+    
+    def on_load_cancelled(self):
+        """Keep showing the part of the file that was indexed before cancelling"""
+        loader = self.sender()
+        if loader is not self.file_loader:
+            return
+        self.cancel_load_btn.hide()
+        self.pending_position = None
+        self.refresh_pagination()
+        self.status_bar.showMessage(
+            f"Loading cancelled - showing the first {loader.document.line_count} lines"
+        )
+    
+    def on_load_failed(self, error):
+        """Report a file that could not be opened"""
+        if self.sender() is not self.file_loader:
+            return
+        self.status_bar.clearMessage()
+        QMessageBox.critical(self, "Error", f"Failed to open file: {error}")
+    
+    def refresh_pagination(self):
+        """Recalculate pagination, keeping the same source line at the top of the left page"""
+        if not self.current_file:
+            return
+        
+        if self.follow_mode and self.follow_pinned:
+            # Following: the end of the file stays in view
+            self.show_last_page()
+            return
+        
+        # Requests already queued by resize events are covered by this pass
+        self.repagination_timer.stop()
+        layout_key = self.text_edit_1.pagination.layout_key
+        anchor_line = self.text_edit_1.first_line_of_page(self.current_left_page)
+        
+        # Both panes read from text_edit_1's pagination model
+        self.text_edit_1.calculate_pagination()
+        self.show_single_page_navigation()
+        
+        if self.text_edit_1.pagination.layout_key == layout_key:
+            # Same page size: more of the file only adds pages after this
+            # one, and a page starting mid-line stays where it is
+            page = self.current_left_page
+        else:
+            page = self.text_edit_1.page_for_line(anchor_line)
+        self.current_left_page = max(1, self.spread_start(page))
+        self.update_page_display()
+    
+    def restore_reading_position(self):
+        """Go back to the page the current file was last read at, once that part is indexed"""
+        state = self.pending_position
+        if state is None:
+            return
+        if self.current_left_page != 1:
+            # The reader has moved on already
+            self.pending_position = None
+            return
+        document = self.text_edit_1.source_document
+        line_index = document.line_for_offset(state['offset'])
+        if line_index is not None and line_index >= document.line_count:
+            return  # Not indexed yet
+        self.pending_position = None
+        if line_index is None:
+            return
+        
+        model = self.text_edit_1.pagination
+        if state.get('page') and state.get('layout') == list(model.layout_key or ()):
+            # Read with the same page size: the saved page is exact even
+            # when the top of the page was in the middle of a long line
+            page = state['page']
+        else:
+            page = model.page_for_line(line_index)
+        page = self.spread_start(page)
+        if page != self.current_left_page:
+            self.current_left_page = page
+            self.update_page_display()
+            self.status_bar.showMessage(f"Resumed {os.path.basename(self.current_file)} at page {page}", 3000)
+    
+    def save_reading_state(self):
+        """Remember the page on screen, and the line index and wrap layout of a large file
+        
+        The state is written by a ReadingStateWriter thread. States saved
+        while it is busy are queued, the newest one per file, so the GUI
+        thread never waits for the disk.
+        """
+        model = self.text_edit_1.pagination
+        view = model.document
+        if view is None or not self.current_file or self.current_file_key is None:
+            return
+        document = view.source
+        plain = view is document
+        state = {
+            'file_path': self.current_file,
+            'key': self.current_file_key,
+            'offset': model.page_byte_range(self.current_left_page)[0] if model.layout_key else 0,
+        }
+        if plain and model.layout_key:
+            # Page numbers of a filtered view do not apply to the whole file
+            state['page'] = self.current_left_page
+            state['layout'] = list(model.layout_key)
+        if (type(document) is MappedDocument and document.index_complete and
+                document.size == self.current_file_key[0] and
+                document.size >= ReadingStateCache.INDEX_MIN_BYTES):
+            state['document'] = document
+            paginator = model.wrap_paginator
+            if plain and model.word_wrap_enabled and paginator is not None and paginator.chunk_line_counts:
+                # The paginator goes on wrapping while the copy is written
+                state['paginator'] = paginator.copy()
+        
+        self.queued_reading_states.pop(self.current_file, None)
+        self.queued_reading_states[self.current_file] = state
+        self.write_reading_states()
+    
+    def write_reading_states(self):
+        """Write the queued reading states one at a time, which keeps them in order"""
+        writer = self.reading_state_writer
+        if writer is not None:
+            if writer.isRunning() and self.sender() is not writer:
+                return  # Called again when it finishes
+            writer.wait()  # Returns at once: the thread is finishing
+            writer.deleteLater()
+            self.reading_state_writer = None
+        
+        if not self.queued_reading_states:
+            if self.closing:
+                self.close()
+            return
+        _, state = self.queued_reading_states.popitem(last=False)
+        writer = ReadingStateWriter(self.reading_state_cache, state, self)
+        writer.failed.connect(self.on_reading_state_write_failed)
+        writer.finished.connect(self.write_reading_states)
+        self.reading_state_writer = writer
+        writer.start()
+    
+    def unwritten_reading_state(self, file_path, key):
+        """Return the newest state saved for a file that is not on disk yet, or None"""
+        state = self.queued_reading_states.get(file_path)
+        writer = self.reading_state_writer
+        if state is None and writer is not None and writer.isRunning() and writer.state['file_path'] == file_path:
+            state = writer.state
+        if state is not None and state['key'] == key:
+            return state
+        return None
+    
+    
+    def on_reading_state_write_failed(self, message):
+        print(f"Warning: Could not save the reading position: {message}")
+    
+    def show_single_page_navigation(self):
+        """Show the page controls once a single-page view has grown past one page"""
+        if not self.two_page_mode and self.text_edit_1.total_pages > 1:
+            self.prev_page_btn.show()
+            self.next_page_btn.show()
+            self.page_info_label.show()
+    
+    def last_left_page(self, last_page=None):
+        """Return the left page that shows last_page, by default the last page"""
+        if last_page is None:
+            last_page = max(self.text_edit_1.total_pages, 1)
+        if not self.two_page_mode or last_page == 1:
+            return last_page
+        if self.sliding_window_mode:
+            return last_page - 1
+        return self.spread_start(last_page)
+
+    def spread_start(self, page):
+        """Return the left page of the spread that shows page"""
+        if self.two_page_mode and not self.sliding_window_mode and page % 2 == 0:
+            # Spreads always start on an odd page
+            return page - 1
+        return page
+    
+    def show_last_page(self):
+        """Paginate to the end of the document and show its last page"""
+        if not self.current_file:
+            return
+        
+        self.repagination_timer.stop()
+        self.text_edit_1.calculate_pagination()
+        # Only the lines added since the last pass still need wrapping, a
+        # slice at a time so the window keeps responding
+        model = self.text_edit_1.pagination
+        last_page = model.paginate_to_end(self.follow_wrap_lines)
+        self.show_single_page_navigation()
+        
+        self.current_left_page = self.last_left_page(last_page)
+        self.update_page_display()
+        if last_page < model.total_pages or not model.total_pages_exact:
+            # Not caught up yet: continue once pending events are handled
+            QTimer.singleShot(0, self.refresh_pagination)
+    
+    def toggle_follow_mode(self):
+        """Toggle follow mode from the menu or the Shift+F shortcut"""
+        self.set_follow_mode(self.follow_action.isChecked())
+    
+    def set_follow_mode(self, enabled):
+        """Start or stop following data appended to the current file, like less +F"""
+        if not self.current_file:
+            enabled = False
+        self.follow_mode = enabled
+        self.follow_action.setChecked(enabled)
+        
+        watched_files = self.file_watcher.files()
+        if watched_files:
+            self.file_watcher.removePaths(watched_files)
+        
+        if enabled:
+            self.file_watcher.addPath(self.current_file)
+            self.follow_poll_timer.start()
+            self.follow_pinned = True
+            self.show_last_page()
+            self.check_followed_file()
+            self.status_bar.showMessage(f"Following: {self.current_file} (Shift+F to stop)")
+        else:
+            self.follow_poll_timer.stop()
+            self.follow_check_timer.stop()
+            self.follow_pinned = False
+            if self.current_file:
+                self.status_bar.showMessage(f"Stopped following: {self.current_file}")
+    
+    def schedule_follow_check(self):
+        """Check the followed file shortly, once per burst of change notifications"""
+        if self.follow_mode and not self.follow_check_timer.isActive():
+            self.follow_check_timer.start()
+    
+    def check_followed_file(self):
+        """Index data appended to the followed file in the background"""
+        if not self.follow_mode:
+            return
+        
+        # Appended data is picked up once the previous pass has finished
+        for loader in (self.file_loader, self.follow_indexer):
+            if loader is not None and loader.isRunning():
+                return
+        
+        document = self.text_edit_1.source_document
+        if document is None:
+            return
+        source = document.source
+        
+        # Files replaced on disk drop out of the watcher
+        if self.current_file not in self.file_watcher.files() and os.path.exists(self.current_file):
+            self.file_watcher.addPath(self.current_file)
+        
+        last_line = max(source.line_count - 1, 0)
+        try:
+            grown = source.refresh()
+        except (OSError, ValueError) as e:
+            self.status_bar.showMessage(f"Cannot follow {self.current_file}: {e}")
+            return
+        
+        if grown < 0:
+            # Truncated or rewritten: start again from the new contents
+            self.status_bar.showMessage(f"File truncated, reloading: {self.current_file}")
+            self.load_document(self.current_file)
+            return
+        if grown == 0 and source.index_complete:
+            return
+        
+        if grown:
+            # The last line may have been incomplete; its pages are rebuilt
+            # while the pages before it stay cached
+            if document is not source:
+                last_line = document.discard_from_source_line(last_line)
+            self.text_edit_1.pagination.discard_from_line(last_line)
+        
+        if self.follow_indexer is not None:
+            self.follow_indexer.deleteLater()
+        indexer = FileLoader(self.current_file, self, document=source)
+        indexer.finished_loading.connect(self.on_follow_indexed)
+        indexer.truncated.connect(self.on_source_truncated)
+        self.follow_indexer = indexer
+        indexer.start()
+    
+    def on_source_truncated(self):
+        """Reopen the file when it shrank under the open document, as follow mode does"""
+        document = self.text_edit_1.source_document
+        # Several readers may notice the same truncation; the reopened file has not shrunk
+        if document is None or not document.source.shrunk():
+            return
+        loader = self.file_loader
+        if loader is not None and loader.isRunning() and loader.document is not document.source:
+            return  # Already reopening it
+        self.status_bar.showMessage(f"File truncated, reloading: {self.current_file}")
+        self.load_document(self.current_file)
+    
+    def on_follow_indexed(self):
+        """Show the data appended to the followed file"""
+        if self.sender() is not self.follow_indexer:
+            return
+        self.refresh_pagination()
+    
+    def stop_follow_indexer(self):
+        """Stop indexing appended data; the next check picks up where it left off"""
+        indexer = self.follow_indexer
+        if indexer is None:
+            return
+        indexer.disconnect()
+        indexer.requestInterruption()
+        indexer.wait()
+        indexer.deleteLater()
+        self.follow_indexer = None
     
     def toggle_line_numbers(self):
         """Toggle line number display"""
@@ -1471,15 +4364,20 @@ class GuiLess(QMainWindow):
         self.text_edit_1.toggle_line_numbers(show)
         if self.two_page_mode:
             self.text_edit_2.toggle_line_numbers(show)
+        # The line number prefix moves the matches
+        self.update_match_highlights()
     
     def toggle_word_wrap(self):
         """Toggle word wrap mode"""
         enable = self.word_wrap_action.isChecked()
+        anchor_line = self.text_edit_1.first_line_of_page(self.current_left_page)
         self.text_edit_1.toggle_word_wrap(enable)
-        if self.two_page_mode:
-            self.text_edit_2.toggle_word_wrap(enable)
-            # Update page display after wrap mode change
-            self.update_page_display()
+        self.text_edit_2.toggle_word_wrap(enable)
+        
+        # Stay on the text that was on screen before the mode change
+        if self.current_file:
+            self.current_left_page = self.text_edit_1.page_for_line(anchor_line)
+            self.refresh_pagination()
     
     def toggle_two_page_mode(self):
         """Toggle between single and two-page mode"""
@@ -1531,34 +4429,26 @@ class GuiLess(QMainWindow):
             self.current_left_page = 1
             self.update_single_page_display()
         else:
-            # Only one page, show full content and hide navigation
+            # Only one page: show it like any other page and hide navigation
             self.prev_page_btn.hide()
             self.next_page_btn.hide()
             self.page_info_label.hide()
             
-            # Show full content with line numbers if enabled
-            content = self.text_edit_1.original_content
-            if self.text_edit_1.show_line_numbers:
-                lines = content.split('\n')
-                numbered_lines = []
-                width = len(str(len(lines)))
-                for i, line in enumerate(lines, 1):
-                    line_num = str(i).rjust(width)
-                    numbered_lines.append(f"{line_num}: {line}")
-                content = '\n'.join(numbered_lines)
-            self.text_edit_1.setPlainText(content)
+            self.current_left_page = 1
+            self.text_edit_1.set_page_content(1)
+            self.update_match_highlights()
     
     def setup_two_page_display(self):
         """Set up the two-page display with proper pagination"""
         if not self.current_file:
             return
             
-        # Load content into both editors for pagination calculation
-        self.text_edit_2.original_content = self.text_edit_1.original_content
+        # The right-hand editor renders pages from the left editor's
+        # pagination model, so the document is paginated only once
+        self.text_edit_2.share_pagination(self.text_edit_1.pagination)
         # Sync word wrap settings
         self.text_edit_2.word_wrap_enabled = self.text_edit_1.word_wrap_enabled
         self.text_edit_2.setLineWrapMode(self.text_edit_1.lineWrapMode())
-        self.text_edit_2.calculate_pagination()
         
         # Start with pages 1 and 2
         self.current_left_page = 1
@@ -1570,18 +4460,29 @@ class GuiLess(QMainWindow):
             return
         
         page_number = self.current_left_page
-        total_pages = max(self.text_edit_1.total_pages, 1)
         
         # Set content for current page
         self.text_edit_1.set_page_content(page_number)
         
+        # Wrapping the page may have turned an estimated page count into
+        # an exact, smaller one
+        total_pages = max(self.text_edit_1.total_pages, 1)
+        if page_number > total_pages:
+            self.current_left_page = total_pages
+            self.update_single_page_display()
+            return
+        
         # Update page info
-        self.page_info_label.setText(f"Page {page_number} of {total_pages}")
+        self.page_info_label.setText(f"Page {page_number} of {self.format_page_total()}")
         
         # Enable/disable navigation buttons
         self.prev_page_btn.setEnabled(page_number > 1)
         self.next_page_btn.setEnabled(page_number < total_pages)
+        
+        self.update_match_highlights()
+        self.prefetch_timer.start()
     
+    @profiled('update_page_display')
     def update_page_display(self):
         """Update the display for current left and right pages"""
         if not self.two_page_mode:
@@ -1599,6 +4500,14 @@ class GuiLess(QMainWindow):
         # Set content for left page
         self.text_edit_1.set_page_content(left_page)
         
+        # Wrapping the page may have turned an estimated page count into
+        # an exact, smaller one
+        total_pages = max(self.text_edit_1.total_pages, 1)
+        if left_page > total_pages:
+            self.current_left_page = total_pages
+            self.update_page_display()
+            return
+        
         # Set content for right page only if it exists
         if right_page <= total_pages:
             self.text_edit_2.set_page_content(right_page)
@@ -1608,10 +4517,11 @@ class GuiLess(QMainWindow):
         
         # Update page info
         mode_text = "Sliding" if self.sliding_window_mode else "Spread"
+        page_total = self.format_page_total()
         if right_page <= total_pages:
-            self.page_info_label.setText(f"Pages {left_page}-{right_page} of {total_pages} ({mode_text})")
+            self.page_info_label.setText(f"Pages {left_page}-{right_page} of {page_total} ({mode_text})")
         else:
-            self.page_info_label.setText(f"Page {left_page} of {total_pages} ({mode_text})")
+            self.page_info_label.setText(f"Page {left_page} of {page_total} ({mode_text})")
         
         # Enable/disable navigation buttons
         self.prev_page_btn.setEnabled(left_page > 1)
@@ -1621,9 +4531,38 @@ class GuiLess(QMainWindow):
         else:
             # In spread mode, we can go next as long as there are at least 2 more pages
             self.next_page_btn.setEnabled(left_page + 1 < total_pages)
+        
+        self.update_match_highlights()
+        self.prefetch_timer.start()
+    
+    def prefetch_pages(self):
+        """Render the next and previous page or spread while the UI is idle"""
+        if not self.current_file:
+            return
+        
+        left_page = self.current_left_page
+        if not self.two_page_mode:
+            pages = [left_page + 1, left_page - 1]
+        else:
+            step = 1 if self.sliding_window_mode else 2
+            pages = [left_page + step, left_page + step + 1,
+                     left_page - step, left_page - step + 1]
+        
+        # Both panes share text_edit_1's model and render cache
+        for page in pages:
+            self.text_edit_1.prefetch_page(page)
+    
+    def format_page_total(self):
+        """Return the page count for display, marking estimates with '~'"""
+        total_pages = max(self.text_edit_1.total_pages, 1)
+        if self.text_edit_1.total_pages_exact:
+            return str(total_pages)
+        return f"~{total_pages}"
     
     def previous_pages(self):
         """Go to previous page(s)"""
+        # Paging back stops follow mode from jumping to new data
+        self.follow_pinned = False
         if self.current_left_page > 1:
             if self.two_page_mode:
                 if self.sliding_window_mode:
@@ -1652,53 +4591,309 @@ class GuiLess(QMainWindow):
                 # Single page mode: move forward by 1 page
                 self.current_left_page = min(total_pages, self.current_left_page + 1)
             self.update_page_display()
+        
+        if self.follow_mode and self.text_edit_1.total_pages_exact:
+            # Paging back to the end resumes following new data
+            self.follow_pinned = self.current_left_page >= self.last_left_page()
     
     def zoom_in(self):
         """Zoom in on text"""
         self.text_edit_1.zoom_in()
-        if self.two_page_mode:
-            self.text_edit_2.zoom_in()
-            # Recalculate pagination after zoom change
-            self.update_page_display()
+        self.text_edit_2.zoom_in()
+        # Recalculate pagination once for both panes after the zoom change
+        self.refresh_pagination()
     
     def zoom_out(self):
         """Zoom out on text"""
         self.text_edit_1.zoom_out()
-        if self.two_page_mode:
-            self.text_edit_2.zoom_out()
-            # Recalculate pagination after zoom change
-            self.update_page_display()
+        self.text_edit_2.zoom_out()
+        # Recalculate pagination once for both panes after the zoom change
+        self.refresh_pagination()
     
     def reset_zoom(self):
         """Reset zoom to default"""
         self.text_edit_1.reset_zoom()
-        if self.two_page_mode:
-            self.text_edit_2.reset_zoom()
-            # Recalculate pagination after zoom change
-            self.update_page_display()
+        self.text_edit_2.reset_zoom()
+        # Recalculate pagination once for both panes after the zoom change
+        self.refresh_pagination()
     
     def find_text(self):
         """Open find dialog"""
-        dialog = FindDialog(self)
+        dialog = FindDialog(self, self.search_term, self.search_regex,
+                            self.search_ignore_case, self.search_whole_word)
         if dialog.exec_() == QDialog.Accepted:
             search_term = dialog.text()
             if search_term:
-                cursor = self.text_edit_1.textCursor()
-                cursor.movePosition(QTextCursor.Start)
-                
-                if cursor.find(search_term):
-                    self.text_edit_1.setTextCursor(cursor)
-                    self.status_bar.showMessage(f"Found: {search_term}", 2000)
-                else:
-                    self.status_bar.showMessage("No matches found.", 2000)
+                self.search_regex, self.search_ignore_case, self.search_whole_word = dialog.options()
+                self.start_search(search_term)
+
+    def filter_text(self):
+        """Open the filter dialog; an empty pattern shows all lines again (like less &)"""
+        document = self.text_edit_1.source_document
+        term = document.term if isinstance(document, FilteredDocument) else ''
+        dialog = FindDialog(self, term, self.search_regex,
+                            self.search_ignore_case, self.search_whole_word)
+        dialog.setWindowTitle("Filter Lines")
+        if dialog.exec_() == QDialog.Accepted:
+            self.search_regex, self.search_ignore_case, self.search_whole_word = dialog.options()
+            self.set_filter(dialog.text())
+
+    def set_filter(self, term):
+        """Show only the lines matching a pattern, or all lines for an empty pattern"""
+        document = self.text_edit_1.source_document
+        if document is None:
+            return
+        source = document.source
+
+        if term:
+            try:
+                pattern = compile_search_pattern(term, source.encoding, self.search_regex,
+                                                 self.search_ignore_case, self.search_whole_word)
+            except re.error as e:
+                QMessageBox.warning(self, "Filter Lines", f"Invalid regular expression: {e}")
+                return
+            except UnicodeEncodeError:
+                QMessageBox.warning(self, "Filter Lines", f"The pattern cannot occur in a {source.encoding} file")
+                return
+            view = FilteredDocument(source, pattern, term)
+        else:
+            view = source
+
+        # Stay near the source line at the top of the page on screen
+        top_line = self.text_edit_1.first_line_of_page(self.current_left_page)
+        anchor = document.line_number(top_line) - 1 if top_line < document.line_count else 0
+        self.text_edit_1.set_source_document(view)
+        if view is not source:
+            anchor = view.view_line_for_source(anchor)
+            # Past the last matching line: show the last page of matches
+            view.ensure_lines(anchor + 1)
+            anchor = min(anchor, max(view.line_count - 1, 0))
+
+        self.current_left_page = self.spread_start(self.text_edit_1.page_for_line(anchor))
+        self.update_page_display()
+        self.update_match_highlights()
+        if term:
+            self.status_bar.showMessage(f"Showing lines matching: {term}")
+        else:
+            self.status_bar.showMessage("Showing all lines", 2000)
+
+    def start_search(self, search_term):
+        """Search the whole document and go to the first match from the current page on"""
+        document = self.text_edit_1.source_document
+        if document is None:
+            return
+        
+        self.search_term = search_term
+        try:
+            pattern = compile_search_pattern(search_term, document.encoding, self.search_regex,
+                                             self.search_ignore_case, self.search_whole_word)
+        except re.error as e:
+            QMessageBox.warning(self, "Find", f"Invalid regular expression: {e}")
+            return
+        except UnicodeEncodeError:
+            QMessageBox.warning(self, "Find", f"The search text cannot occur in a {document.encoding} file")
+            return
+        
+        self.stop_search()
+        # Like less, search forward from the top of the page on screen
+        top_line = self.text_edit_1.first_line_of_page(self.current_left_page)
+        if top_line < len(document.line_starts):
+            origin = document.line_starts[top_line]
+        else:
+            origin = document.size
+        self.search_offset = origin - 1
+        
+        # Filtered views are searched through the whole file they show
+        engine = SearchEngine(document.source, pattern, search_term, self, origin=origin)
+        engine.matches_found.connect(self.on_search_progress)
+        engine.first_hit.connect(self.on_search_first_hit)
+        engine.finished_searching.connect(self.on_search_finished)
+        engine.truncated.connect(self.on_source_truncated)
+        engine.parallel_failed.connect(self.on_parallel_search_failed)
+        self.search_engine = engine
+        self.search_pending = True
+        self.status_bar.showMessage(f"Searching: {search_term}...")
+        engine.start()
+    
+    def stop_search(self):
+        """Stop the running search and forget its matches"""
+        engine = self.search_engine
+        if engine is None:
+            return
+        engine.disconnect()
+        engine.requestInterruption()
+        engine.wait()
+        engine.deleteLater()
+        self.search_engine = None
+        self.search_pending = False
+        self.update_match_highlights()
+    
+    def on_search_progress(self, match_count):
+        """Highlight new matches on screen and go to the one the user is waiting for"""
+        if self.sender() is not self.search_engine:
+            return
+        if self.search_pending:
+            # Going to a match highlights the pages it shows
+            self.find_next()
+        else:
+            self.update_match_highlights()
+    
+    def on_search_first_hit(self, offset, length):
+        """Go to the first match of a parallel search before the matches ahead of it are in"""
+        if self.sender() is not self.search_engine or not self.search_pending:
+            return
+        if offset <= self.search_offset or not self.match_is_shown(offset):
+            return
+        self.search_pending = False
+        self.show_offset(offset, length)
+        self.status_bar.showMessage(f"Match found, still searching: {self.search_engine.term}")
+    
+    def on_search_finished(self):
+        """Report the final match count, or that nothing was found"""
+        if self.sender() is not self.search_engine:
+            return
+        self.update_match_highlights()
+        if self.search_pending:
+            self.find_next()
+        elif self.search_engine.matches:
+            self.show_match_status()
+    
+    def on_parallel_search_failed(self, message):
+        print(f"Warning: Could not search in parallel, searching in one process: {message}")
     
     def find_next(self):
-        """Find next occurrence (placeholder)"""
-        pass
+        """Go to the next match of the last search"""
+        engine = self.search_engine
+        if engine is None:
+            self.status_bar.showMessage("No previous search", 2000)
+            return
+        
+        matches = engine.matches
+        index = bisect_right(matches, self.search_offset)
+        while index < len(matches) and not self.match_is_shown(matches[index]):
+            index += 1
+        if index < len(matches):
+            self.search_pending = False
+            self.show_match(index)
+        elif not engine.complete:
+            # The scan has not got that far yet; on_search_progress retries
+            self.search_pending = True
+        else:
+            self.search_pending = False
+            if matches:
+                self.status_bar.showMessage(f"No more matches for: {engine.term}", 2000)
+            else:
+                self.status_bar.showMessage(f"Pattern not found: {engine.term}", 2000)
     
     def find_previous(self):
-        """Find previous occurrence (placeholder)"""
-        pass
+        """Go to the previous match of the last search"""
+        engine = self.search_engine
+        if engine is None:
+            self.status_bar.showMessage("No previous search", 2000)
+            return
+        
+        self.search_pending = False
+        index = bisect_left(engine.matches, self.search_offset) - 1
+        while index >= 0 and not self.match_is_shown(engine.matches[index]):
+            index -= 1
+        if index >= 0:
+            self.show_match(index)
+        else:
+            self.status_bar.showMessage(f"No earlier matches for: {engine.term}", 2000)
+    
+    def match_is_shown(self, offset):
+        """Check whether a match is on a line of the view; a filter hides the others"""
+        return self.text_edit_1.source_document.line_for_offset(offset) is not None
+    
+    def show_match(self, index):
+        """Bring the page holding a match into view and select the match"""
+        engine = self.search_engine
+        if self.show_offset(engine.matches[index], engine.match_lengths[index]):
+            self.show_match_status(index)
+    
+    def show_offset(self, offset, byte_length):
+        """Bring a match given by byte offset into view and select it; False if not loaded"""
+        document = self.text_edit_1.source_document
+        line_index = document.line_for_offset(offset)
+        if line_index is None:
+            return False
+        if line_index >= document.line_count:
+            self.status_bar.showMessage("Match is past the part of the file loaded so far", 2000)
+            return False
+        
+        self.search_offset = offset
+        page, row, column = self.text_edit_1.pagination.locate_offset(offset)
+        length = len(document.decode(offset, offset + byte_length))
+        
+        # Jumping to a match stops follow mode from jumping to new data
+        self.follow_pinned = False
+        pane = self.show_page(page)
+        self.update_match_highlights()
+        pane.select_text(row, column, length)
+        return True
+    
+    def show_match_status(self, index=None):
+        """Show the match count of the last search in the status bar"""
+        engine = self.search_engine
+        if index is None:
+            index = bisect_left(engine.matches, self.search_offset)
+            if index >= len(engine.matches) or engine.matches[index] != self.search_offset:
+                self.status_bar.showMessage(f"{len(engine.matches)} matches for: {engine.term}")
+                return
+        match_total = len(engine.matches) if engine.complete else f"{len(engine.matches)}+"
+        self.status_bar.showMessage(f"Match {index + 1} of {match_total}: {engine.term}")
+    
+    def update_match_highlights(self):
+        """Highlight the matches of the last search on the pages on screen"""
+        panes = [(self.text_edit_1, self.current_left_page)]
+        if self.two_page_mode:
+            panes.append((self.text_edit_2, self.current_left_page + 1))
+        
+        for pane, page in panes:
+            positions = []
+            if self.search_engine is not None and pane.source_document is not None:
+                if page <= pane.total_pages:
+                    positions = self.match_positions(page)
+            pane.highlight_matches(positions)
+    
+    def match_positions(self, page):
+        """Return the (row, column, length) of every known match on a page
+
+        Only the matches inside the page's byte range are looked at, so the
+        cost follows the number of matches on screen, not in the document.
+        """
+        engine = self.search_engine
+        model = self.text_edit_1.pagination
+        document = model.document
+        matches = engine.matches
+        match_lengths = engine.match_lengths
+        start, end = model.page_byte_range(page)
+        
+        positions = []
+        for index in range(bisect_left(matches, start), bisect_left(matches, end)):
+            offset = matches[index]
+            line_index = document.line_for_offset(offset)
+            if line_index is None:
+                continue  # On a line hidden by the filter
+            if line_index >= document.line_count:
+                break
+            match_page, row, column = model.locate_offset(offset)
+            if match_page == page:
+                length = len(document.decode(offset, offset + match_lengths[index]))
+                positions.append((row, column, length))
+        return positions
+    
+    def show_page(self, page):
+        """Bring a page into view unless it is already shown; return the pane showing it"""
+        left_page = self.current_left_page
+        if page == left_page:
+            return self.text_edit_1
+        if self.two_page_mode and page == left_page + 1:
+            return self.text_edit_2
+        
+        self.current_left_page = self.spread_start(page)
+        self.update_page_display()
+        return self.text_edit_1 if self.current_left_page == page else self.text_edit_2
     
     def update_cursor_position(self):
         """Update cursor position in status bar"""
@@ -1713,6 +4908,7 @@ class GuiLess(QMainWindow):
         github_help_url = "https://github.com/juren53/guiless/blob/main/Docs/HELP.md"
         
         try:
+            import webbrowser
             webbrowser.open(github_help_url)
             self.status_bar.showMessage("Opening User Guide in web browser...", 3000)
         except Exception as e:
@@ -1727,6 +4923,8 @@ class GuiLess(QMainWindow):
     def change_theme(self):
         """Open theme selection dialog"""
         dialog = ThemeDialog(self.current_theme, self.theme_manager, self)
+        # Browsing the themes previews them on the pages on screen
+        dialog.theme_combo.currentTextChanged.connect(self.preview_theme)
         if dialog.exec_() == QDialog.Accepted:
             new_theme = dialog.get_selected_theme()
             if new_theme != self.current_theme:
@@ -1734,11 +4932,31 @@ class GuiLess(QMainWindow):
                 self.apply_theme(new_theme)
                 self.save_config()
                 self.status_bar.showMessage(f"Theme changed to {new_theme}", 2000)
+                return
+        self.preview_theme(self.current_theme)
+    
+    @profiled('preview_theme')
+    def preview_theme(self, theme_name):
+        """Show a theme on the visible panes only, without restyling the window"""
+        theme = self.theme_manager.get_theme(theme_name)
+        self.text_edit_1.set_theme_colors(theme)
+        if self.two_page_mode:
+            self.text_edit_2.set_theme_colors(theme)
+        self.update_match_highlights()
     
+    @profiled('apply_theme')
     def apply_theme(self, theme_name):
         """Apply the specified theme to the application"""
-        stylesheet = self.theme_manager.generate_stylesheet(theme_name)
-        self.setStyleSheet(stylesheet)
+        stylesheet = self.theme_manager.get_stylesheet(theme_name)
+        # Setting a stylesheet re-polishes every widget in the window, menus
+        # included, so it is only done when the stylesheet actually changes
+        if stylesheet != self.styleSheet():
+            self.setStyleSheet(stylesheet)
+        
+        theme = self.theme_manager.get_theme(theme_name)
+        for pane in (self.text_edit_1, self.text_edit_2):
+            pane.set_theme_colors(theme)
+        self.update_match_highlights()
         
         # Update window title to reflect current theme if different from default
         if theme_name != 'Default':
@@ -1833,27 +5051,111 @@ class GuiLess(QMainWindow):
             self.update_page_display()
         
         self.status_bar.showMessage("Navigation mode: Spread View (1-2, 3-4, 5-6...)", 3000)
+    
+    # Spans shown in the profiling readout, with their short labels
+    PROFILE_READOUT = [
+        ('update_page_display', 'flip'),
+        ('set_page_content', 'page'),
+        ('calculate_pagination', 'paginate'),
+        ('index_file', 'index'),
+        ('open_to_first_page', 'open'),
+        ('time_to_first_page', 'startup'),
+        ('apply_theme', 'theme'),
+    ]
+    
+    def set_profiling(self, enabled):
+        """Turn the profiling debug mode on or off"""
+        profiler.enabled = enabled
+        self.profile_action.setChecked(enabled)
+        self.profile_label.setVisible(enabled)
+        if enabled:
+            self.profile_timer.start()
+            self.update_profile_readout()
+            self.status_bar.showMessage("Profiling on: last/p95 times in ms (Help > Save Profile Trace...)", 3000)
+        else:
+            self.profile_timer.stop()
+    
+    def update_profile_readout(self):
+        """Show the last and p95 run times of the hot paths and the memory in use"""
+        parts = []
+        tooltip = ["Span: last / p95 (ms)"]
+        for name, label in self.PROFILE_READOUT:
+            stats = profiler.stats(name)
+            if stats is not None:
+                parts.append(f"{label} {stats[0] * 1000:.1f}/{stats[1] * 1000:.1f}")
+        for name in sorted(profiler.durations):
+            last, p95 = profiler.stats(name)
+            tooltip.append(f"{name}: {last * 1000:.2f} / {p95 * 1000:.2f}")
+        
+        rss = memory_usage()
+        if rss is not None:
+            profiler.record_memory(rss)
+            parts.append(f"{rss / (1024 * 1024):.0f} MB")
+        self.profile_label.setText(" | ".join(parts) or "Profiling...")
+        self.profile_label.setToolTip("\n".join(tooltip))
+    
+    def save_profile_trace(self):
+        """Save the profiled session as a Chrome trace-event JSON file"""
+        if not profiler.events:
+            QMessageBox.information(self, "Save Profile Trace",
+                                    "Nothing has been profiled yet. Turn on Help > Profiling first.")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Profile Trace", str(Path(self.last_directory) / "guiless-trace.json"),
+            "Chrome Trace (*.json);;All Files (*)"
+        )
+        if file_path:
+            try:
+                profiler.dump_trace(file_path)
+                self.status_bar.showMessage(f"Profile trace saved: {file_path}", 3000)
+            except OSError as e:
+                QMessageBox.warning(self, "Save Profile Trace", f"Failed to save trace: {e}")
+    
+    def closeEvent(self, event):
+        """Stop any background work and save pending settings before the window closes
+        
+        The reading state can take a while to write (a large line index, a
+        network drive), so the window is hidden at once and closes for good
+        when the writer is done.
+        """
+        self.cancel_loading(wait=True)
+        self.stop_follow_indexer()
+        self.stop_search()
+        self.stop_recent_file_checkers()
+        if not self.closing:
+            self.closing = True
+            self.save_reading_state()
+        if self.reading_state_writer is not None or self.queued_reading_states:
+            self.hide()
+            event.ignore()
+            return
+        self.flush_config()
+        super().closeEvent(event)
 
 def main():
     """Main application entry point"""
     app = QApplication(sys.argv)
     
+    # Qt has removed the options it handles (-style etc.) from sys.argv
+    parser = argparse.ArgumentParser(description="GUI Less - a GUI version of the less utility")
+    parser.add_argument('file', nargs='?', help="file to open (default: the most recent file)")
+    parser.add_argument('--profile', action='store_true',
+                        help="time the display hot paths and show them in the status bar")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="with --profile, save the session as a Chrome trace when exiting")
+    args = parser.parse_args(sys.argv[1:])
+    
     window = GuiLess()
+    if args.profile or args.trace:
+        window.set_profiling(True)
     window.show()
     
     # Handle command line arguments
-    if len(sys.argv) > 1:
-        file_path = sys.argv[1]
+    if args.file:
+        file_path = args.file
         if os.path.exists(file_path):
             # Load the file specified on command line
-            if window.text_edit_1.load_file(file_path):
-                window.current_file = file_path
-                window.setWindowTitle(f"GUI Less - {os.path.basename(file_path)}")
-                window.add_recent_file(file_path)
-                
-                # If in two-page mode, set up pagination
-                if window.two_page_mode:
-                    window.setup_two_page_display()
+            window.load_document(file_path)
         else:
             print(f"Error: File '{file_path}' not found.")
             sys.exit(1)
@@ -1861,7 +5163,10 @@ def main():
         # No command line argument, try to load most recent file
         window.load_most_recent_file()
     
-    sys.exit(app.exec_())
+    status = app.exec_()
+    if args.trace:
+        profiler.dump_trace(args.trace)
+    sys.exit(status)
 
 
 if __name__ == '__main__':
@@ -11,6 +11,7 @@ fi
 # Get the directory where this script is located
 DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 
-# Run the application with any provided arguments
-python3 "$DIR/guiless.py" "$@"
-
+# Run the application with any provided arguments. Running it as a module
+# (-m) reuses the compiled bytecode in __pycache__; a script path is
+# recompiled on every start.
+PYTHONPATH="$DIR${PYTHONPATH:+:$PYTHONPATH}" python3 -m guiless "$@"